@@ -0,0 +1,241 @@
+"""
+時間割生成のベンチマーク。
+合成データ（synthetic_data.py）をクラス数ごとに生成し、次のフェーズを本番と同じ処理（pipeline.publish_site）で計測する。
+- parse: クラス一覧.csv と Class_names.csv の読み込み（watch・backfill と同じ一括読み込み）
+- generate: 空の docs への generate（読み込み・全ページと週のバンドルの書き出し・公開）
+- rerun: 入力を変えずに generate をもう一度実行（変更のないページは書き出さない）
+- next_week: 2週目以降の generate の合計（前の週のアーカイブを含む）
+各フェーズの内訳として、profiler が記録する generate の処理ごとの時間（load_class_data, render_pages,
+week_bundle, publish など）もあわせて記録する。
+結果はベースライン（baselines.json）と内訳まで比較し、許容範囲を超えて遅くなったフェーズを報告する。
+ベースラインには、計測したマシンの情報（_machine）も保存する。時間は同じマシンで計測した場合にだけ比較できる。
+あわせて、generate のピークメモリを tracemalloc で計測する（比較の対象外）。
+ネットワークには一切アクセスしない。
+
+使い方:
+    python benchmarks/run_benchmarks.py                          # 18, 180, 1800 クラスで計測
+    python benchmarks/run_benchmarks.py --classes 18,3000 --weeks 52
+    python benchmarks/run_benchmarks.py --update-baseline        # 現在の結果をベースラインとして保存
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import tracemalloc
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from python_scripts import config
+from python_scripts import data_parser
+from python_scripts import pipeline
+from python_scripts import profiler
+from benchmarks import synthetic_data
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+PHASES = ("parse", "generate", "rerun", "next_week")
+
+@contextlib.contextmanager
+def _quiet():
+    """生成処理の1ページごとのログを計測中は捨てる"""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def _make_config(data_dir, output_dir):
+    cfg = config.load_config()
+    cfg["data_dir"] = data_dir
+    cfg["github_pages_output_base_dir"] = output_dir
+    return cfg
+
+def _parse(cfg):
+    class_list_week = data_parser.parse_class_list(
+        os.path.join(cfg["data_dir"], cfg["class_list_csv_filename"]),
+        cfg["csv_encoding"], cfg["csv_data_start_col_offset"], cfg["num_periods_per_day"]
+    )
+    master_class_info_list = data_parser.load_class_names_list(
+        os.path.join(cfg["data_dir"], cfg["class_names_csv_filename"]), cfg["csv_encoding"]
+    )
+    return class_list_week, master_class_info_list
+
+def _generate(cfg):
+    """generate コマンドと同じ処理を実行し、(書き出したページ数, 処理ごとの実時間の辞書) を返す"""
+    with profiler.Profiler(enabled=True, trace_memory=False) as prof:
+        with prof.phase("load_class_data"):
+            class_list_week, master_class_info_list = pipeline.load_class_data(cfg)
+        with prof.phase("load_teacher_data"):
+            teacher_info_list, teacher_index = pipeline.load_teacher_data(cfg)
+        pipeline.publish_site(cfg, class_list_week, master_class_info_list, teacher_info_list, teacher_index, prof=prof)
+    report = prof.report()
+    return report["pages_written"], {phase["name"]: phase["wall_seconds"] for phase in report["phases"]}
+
+def _add_phase_seconds(total, phase_seconds):
+    for name, seconds in phase_seconds.items():
+        total[name] = total.get(name, 0.0) + seconds
+    return total
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+def _generate_peak_bytes(cfg):
+    """
+    generate のPythonのメモリ割り当てのピーク（バイト）。
+    クラス行は1行ずつ読みながら書き出すため、クラス数が増えても緩やかにしか増えない。
+    """
+    tracemalloc.start()
+    try:
+        _generate(cfg)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def _directory_size(root_dir):
+    """ハードリンクは1回だけ数えたディスク使用量（バイト）"""
+    seen_inodes = set()
+    total = 0
+    for dirpath, _, filenames in os.walk(root_dir):
+        for filename in filenames:
+            stat_result = os.lstat(os.path.join(dirpath, filename))
+            if (stat_result.st_dev, stat_result.st_ino) in seen_inodes:
+                continue
+            seen_inodes.add((stat_result.st_dev, stat_result.st_ino))
+            total += stat_result.st_size
+    return total
+
+def run_scale(work_dir, num_classes, num_weeks, repeat):
+    """1つのクラス数について各フェーズを repeat 回計測し、最小値を返す"""
+    data_root = os.path.join(work_dir, f"data_{num_classes}")
+    weeks = synthetic_data.generate_weeks(data_root, num_classes, max(num_weeks, 1))
+    week_data_dirs = [week_dir for _, week_dir in weeks]
+
+    timings = {phase: [] for phase in PHASES}
+    # generate・rerun・next_week の処理ごとの時間（フェーズ名 → 処理名 → 計測ごとの値）
+    phase_timings = {phase: {} for phase in PHASES[1:]}
+    result = {}
+    for attempt in range(repeat):
+        output_dir = os.path.join(work_dir, f"docs_{num_classes}_{attempt}")
+        cfg = _make_config(week_data_dirs[0], output_dir)
+        with _quiet():
+            timings["parse"].append(_timed(_parse, cfg)[0])
+
+            seconds, (result["generate_pages_written"], phase_seconds) = _timed(_generate, cfg)
+            timings["generate"].append(seconds)
+            attempt_phases = {"generate": phase_seconds}
+            seconds, (result["rerun_pages_written"], attempt_phases["rerun"]) = _timed(_generate, cfg)
+            timings["rerun"].append(seconds)
+
+            next_week_seconds = 0.0
+            attempt_phases["next_week"] = {}
+            for week_data_dir in week_data_dirs[1:]:
+                cfg["data_dir"] = week_data_dir
+                seconds, (_, phase_seconds) = _timed(_generate, cfg)
+                next_week_seconds += seconds
+                _add_phase_seconds(attempt_phases["next_week"], phase_seconds)
+            timings["next_week"].append(next_week_seconds)
+        for phase, phase_seconds in attempt_phases.items():
+            for name, seconds in phase_seconds.items():
+                phase_timings[phase].setdefault(name, []).append(seconds)
+        result["docs_bytes"] = _directory_size(output_dir)
+        shutil.rmtree(output_dir)
+
+    result.update({phase: min(values) for phase, values in timings.items()})
+    result["phases"] = {
+        phase: {name: min(values) for name, values in names.items()} for phase, names in phase_timings.items()
+    }
+    peak_dir = os.path.join(work_dir, f"peak_{num_classes}")
+    with _quiet():
+        result["generate_peak_bytes"] = _generate_peak_bytes(_make_config(week_data_dirs[0], peak_dir))
+    shutil.rmtree(peak_dir)
+    return result
+
+def machine_info():
+    """ベースラインに保存する、計測したマシンの情報"""
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+
+def compare_with_baseline(results, baseline, tolerance):
+    """ベースラインより tolerance の割合以上遅くなったフェーズ（処理ごとの内訳を含む）を返す"""
+    regressions = []
+    for scale, phases in results.items():
+        baseline_phases = baseline.get(scale, {})
+        measurements = [(phase, phases[phase], baseline_phases.get(phase)) for phase in PHASES]
+        for phase, names in phases.get("phases", {}).items():
+            baseline_names = baseline_phases.get("phases", {}).get(phase, {})
+            measurements += [(f"{phase}.{name}", seconds, baseline_names.get(name)) for name, seconds in names.items()]
+        for label, seconds, baseline_seconds in measurements:
+            if baseline_seconds is None:
+                continue
+            # ごく短い計測はばらつきが大きいため、1ミリ秒の余裕を持たせる
+            if seconds > baseline_seconds * (1 + tolerance) + 0.001:
+                regressions.append(f"{scale}: {label} {baseline_seconds:.4f}s → {seconds:.4f}s")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="時間割生成の各フェーズを合成データで計測します。")
+    parser.add_argument("--classes", default="18,180,1800", help="計測するクラス数（カンマ区切り、既定: 18,180,1800）")
+    parser.add_argument("--weeks", type=int, default=4, help="公開する週数。2週目以降が next_week フェーズ (既定: 4)")
+    parser.add_argument("--repeat", type=int, default=3, help="計測の繰り返し回数、最小値を採用 (既定: 3)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="ベースラインのJSONファイル")
+    parser.add_argument("--update-baseline", action="store_true", help="今回の結果をベースラインとして保存する")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="遅延とみなす割合 (既定: 0.25 = 25%%)")
+    parser.add_argument("--output-json", help="計測結果をJSONで書き出すパス")
+    args = parser.parse_args(argv)
+
+    scales = [int(value) for value in args.classes.split(",") if value.strip()]
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="timetable_bench_") as work_dir:
+        for num_classes in scales:
+            scale_key = f"{num_classes}classes_{args.weeks}weeks"
+            results[scale_key] = run_scale(work_dir, num_classes, args.weeks, args.repeat)
+            phases = results[scale_key]
+            print(f"{scale_key}: " + "  ".join(f"{phase}={phases[phase]:.4f}s" for phase in PHASES)
+                  + f"  rerun_pages={phases['rerun_pages_written']}  docs={phases['docs_bytes'] / 1024:.0f}KiB"
+                  + f"  peak={phases['generate_peak_bytes'] / 1024:.0f}KiB")
+            for phase, names in phases["phases"].items():
+                print(f"  {phase} の内訳: " + "  ".join(f"{name}={seconds:.4f}s" for name, seconds in names.items()))
+
+    if args.output_json:
+        with open(args.output_json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        baseline["_machine"] = machine_info()
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=1, sort_keys=True)
+        print(f"ベースラインを {args.baseline} に保存しました。")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("ベースラインがないため比較を省略しました（--update-baseline で作成できます）。")
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get("_machine") not in (None, machine_info()):
+        print(f"警告: ベースラインは別のマシン ({baseline['_machine']['platform']}) で計測されたため、比較の結果は参考値です。")
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"警告: 性能の低下: {regression}")
+    if regressions:
+        return 1
+    print("ベースラインと比べて性能の低下はありません。")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+起動時間のベンチマーク。
+合成データ（synthetic_data.py）に対して `python run_timetable_generator.py` を新しいプロセスで繰り返し実行し、
+コマンド全体の実時間を計測する。あわせて `-X importtime` の結果から、インポートに時間のかかったモジュールと
+pandas / numpy が読み込まれていないことを報告する。ネットワークには一切アクセスしない。
+
+使い方:
+    python benchmarks/startup_benchmark.py                  # 18 クラスで 10 回計測
+    python benchmarks/startup_benchmark.py --classes 180 --repeat 20
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# プロジェクトルートをPythonのパスに追加し、benchmarks パッケージをインポートできるようにする
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks import synthetic_data
+
+ENTRY_POINT = os.path.join(PROJECT_ROOT, "run_timetable_generator.py")
+# 起動時に読み込まれてはいけない重い依存パッケージ
+HEAVY_MODULES = ("pandas", "numpy")
+
+def _command(data_dir, output_dir, extra_args=()):
+    return [sys.executable, *extra_args, ENTRY_POINT, "--data-dir", data_dir, "--output-dir", output_dir]
+
+def time_cold_runs(data_dir, output_dir, repeat):
+    """新しいプロセスで repeat 回実行し、各回の実時間（秒）のリストを返す"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(_command(data_dir, output_dir, ["-B"]), check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def parse_importtime(stderr_text):
+    """
+    `-X importtime` の出力から、トップレベルのパッケージごとの累積インポート時間（秒）を返す。
+    出力の各行は "import time: 自身[us] | 累積[us] | モジュール名" の形式で、
+    モジュール名の前には区切りの空白1つと、入れ子の深さに応じたインデントが付く。
+    """
+    cumulative = {}
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, raw_name = line[len("import time:"):].split("|")
+        # インデントのないモジュールが、そのパッケージのインポート全体を表す（入れ子の分は累積に含まれている）
+        if raw_name[1:] == raw_name[1:].lstrip():
+            top_level = raw_name.strip().split(".")[0]
+            cumulative[top_level] = cumulative.get(top_level, 0.0) + int(cumulative_us) / 1e6
+    return cumulative
+
+def measure_imports(data_dir, output_dir):
+    result = subprocess.run(
+        _command(data_dir, output_dir, ["-B", "-X", "importtime"]),
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    return parse_importtime(result.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="run_timetable_generator.py の起動から終了までの時間を計測します。")
+    parser.add_argument("--classes", type=int, default=18, help="合成データのクラス数 (既定: 18)")
+    parser.add_argument("--repeat", type=int, default=10, help="計測の繰り返し回数 (既定: 10)")
+    parser.add_argument("--top", type=int, default=8, help="表示するインポートの件数 (既定: 8)")
+    parser.add_argument("--output-json", help="計測結果をJSONで書き出すパス")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="timetable_startup_") as work_dir:
+        (_, data_dir), = synthetic_data.generate_weeks(os.path.join(work_dir, "data"), args.classes, 1)
+        output_dir = os.path.join(work_dir, "docs")
+        # 1回目は出力先の作成やバイトコードキャッシュの作成を含むため、計測から除く
+        subprocess.run(_command(data_dir, output_dir), check=True, stdout=subprocess.DEVNULL)
+        timings = time_cold_runs(data_dir, output_dir, args.repeat)
+        imports = measure_imports(data_dir, output_dir)
+
+    results = {
+        "classes": args.classes,
+        "min_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "imports": dict(sorted(imports.items(), key=lambda item: item[1], reverse=True)),
+    }
+    print(f"{args.classes} クラス: 最小 {results['min_seconds']:.4f}s  中央値 {results['median_seconds']:.4f}s（{args.repeat} 回）")
+    print("--- インポート時間の上位 ---")
+    for module_name, seconds in list(results["imports"].items())[:args.top]:
+        print(f"{module_name:<24} {seconds:.4f}s")
+
+    if args.output_json:
+        with open(args.output_json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+
+    loaded_heavy_modules = [module_name for module_name in HEAVY_MODULES if module_name in imports]
+    if loaded_heavy_modules:
+        print(f"警告: 起動時に {', '.join(loaded_heavy_modules)} が読み込まれています。")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+ベンチマーク用の合成データ生成。
+実データと同じ cp932 のレイアウトで、クラス一覧.csv / Class_names.csv / 時間割.csv / 時間割data.csv /
+teacher_names.csv を任意のクラス数・週数で書き出す。
+
+使い方:
+    python benchmarks/synthetic_data.py OUTPUT_DIR --classes 1800 --weeks 52
+"""
+import os
+import sys
+import random
+import argparse
+import datetime
+
+DAYS_OF_WEEK = ["月", "火", "水", "木", "金"]
+FULLWIDTH_DIGITS = str.maketrans("0123456789", "０１２３４５６７８９")
+# (正式名, 略称)
+SUBJECTS = [
+    ("論理国語", "論国"), ("古典探究", "古典"), ("数学Ⅱ", "数Ⅱ"), ("数学B", "数B"), ("英語コミュニケーション", "英C"),
+    ("論理・表現", "論表"), ("化学", "化学"), ("物理", "物理"), ("生物基礎", "生基"), ("日本史探究", "日史"),
+    ("地理探究", "地理"), ("公共", "公共"), ("体育", "体"), ("芸術", "芸"), ("情報Ⅰ", "情報"), ("総合的な探究", "総合"),
+]
+TEACHER_FAMILY_NAMES = ["佐藤", "鈴木", "高橋", "田中", "伊藤", "渡辺", "山本", "中村", "小林", "加藤", "吉田", "山田"]
+
+def _fullwidth(value):
+    return str(value).translate(FULLWIDTH_DIGITS)
+
+def _quote_row(cells):
+    return ",".join(f'"{cell}"' for cell in cells)
+
+def _write_cp932(path, lines, line_terminator="\r\n"):
+    with open(path, 'w', encoding='cp932', newline='') as f:
+        f.write(line_terminator.join(lines) + line_terminator)
+
+def make_school(num_classes, num_periods=6, seed=0):
+    """
+    クラスと教師の一覧を作る。学年は3つ、各学年に均等にクラスを割り当てる。
+    戻り値は {"classes": [(CSV名, 表示名, ファイル名, 略号), ...], "teachers": [教師名, ...]}。
+    """
+    per_grade = max(1, -(-num_classes // 3))
+    classes = []
+    for class_index in range(num_classes):
+        grade = 3 - class_index // per_grade
+        number = class_index % per_grade + 1
+        classes.append((
+            f"{_fullwidth(grade)}－{_fullwidth(number)}",
+            f"{grade}年{number}組",
+            f"C{grade}_{number:03d}",
+            f"{grade}{number}",
+        ))
+    # 同じコマに同じ教師が重ならないよう、教師数はクラス数以上にする
+    num_teachers = max(num_classes * 3, 5)
+    teachers = [f"{TEACHER_FAMILY_NAMES[i % len(TEACHER_FAMILY_NAMES)]}{i // len(TEACHER_FAMILY_NAMES) + 1}" for i in range(num_teachers)]
+    return {"classes": classes, "teachers": teachers, "num_periods": num_periods, "seed": seed}
+
+def _class_random(school, class_index, version):
+    """クラスごと・版ごとに独立した乱数（ほかのクラスの入れ替えの影響を受けない）"""
+    return random.Random(f"{school['seed']}:{class_index}:{version}")
+
+def make_week_lessons(school, week_index, change_ratio=0.1):
+    """
+    1週分の授業を作る。lessons[クラス][曜日][時限] は SUBJECTS の番号、空きコマは None。
+    各クラスは週ごとに change_ratio の確率で授業が入れ替わり、入れ替わらなかったクラスは前の週と同じになる。
+    乱数はクラスごとに独立しているため、あるクラスの入れ替えがほかのクラスの授業を変えることはない。
+    """
+    num_periods = school["num_periods"]
+    lessons = []
+    for class_index in range(len(school["classes"])):
+        # 最後に入れ替わった週を版として、その版の乱数から授業を作る（一度も入れ替わっていなければ版 0）
+        version = 0
+        for past_week_index in range(week_index, 0, -1):
+            if _class_random(school, class_index, f"change{past_week_index}").random() < change_ratio:
+                version = past_week_index
+                break
+        class_random = _class_random(school, class_index, version)
+        class_lessons = []
+        for day_index in range(len(DAYS_OF_WEEK)):
+            day_lessons = []
+            for period_index in range(num_periods):
+                # 水曜の午後などの空きコマを再現する
+                if class_random.random() < 0.12:
+                    day_lessons.append(None)
+                else:
+                    day_lessons.append(class_random.randrange(len(SUBJECTS)))
+            class_lessons.append(day_lessons)
+        lessons.append(class_lessons)
+    return lessons
+
+def _teacher_for(school, class_index, day_index, period_index):
+    num_classes = len(school["classes"])
+    slot = day_index * school["num_periods"] + period_index
+    return school["teachers"][(class_index + slot * num_classes) % len(school["teachers"])]
+
+def write_week(output_dir, school, week_start, lessons):
+    """1週分のデータファイル一式を output_dir に書き出す"""
+    os.makedirs(output_dir, exist_ok=True)
+    num_periods = school["num_periods"]
+
+    # --- クラス一覧.csv ---
+    date_row = [" "]
+    for day_index, day_char in enumerate(DAYS_OF_WEEK):
+        day = week_start + datetime.timedelta(days=day_index)
+        date_row += [f" {day.month}/{day.day} ({day_char})"] + [""] * (num_periods - 1)
+    period_row = [" "] + [_fullwidth(period) for period in range(1, num_periods + 1)] * len(DAYS_OF_WEEK)
+    lines = ['"＜クラスの授業時間割一覧＞"', _quote_row(date_row + [""]), _quote_row(period_row + [""])]
+    for (csv_name, _, _, _), class_lessons in zip(school["classes"], lessons):
+        cells = [f" {csv_name}"]
+        for day_lessons in class_lessons:
+            cells += [" " if lesson is None else f" {SUBJECTS[lesson][1]}" for lesson in day_lessons]
+        lines.append(_quote_row(cells + [""]))
+    _write_cp932(os.path.join(output_dir, "クラス一覧.csv"), lines)
+
+    # --- Class_names.csv ---
+    _write_cp932(
+        os.path.join(output_dir, "Class_names.csv"),
+        [f"{display_name},{filename_base}" for _, display_name, filename_base, _ in school["classes"]]
+    )
+
+    # --- 時間割.csv / 時間割data.csv ---
+    short_lines = []
+    data_lines = []
+    padding = [""] * 12
+    for day_index, day_char in enumerate(DAYS_OF_WEEK):
+        for period_index in range(num_periods):
+            period_str = _fullwidth(period_index + 1)
+            for class_index, (csv_name, _, _, class_code) in enumerate(school["classes"]):
+                lesson = lessons[class_index][day_index][period_index]
+                if lesson is None:
+                    continue
+                full_subject, short_subject = SUBJECTS[lesson]
+                teacher = _teacher_for(school, class_index, day_index, period_index)
+                short_lines.append(",".join([day_char, period_str, class_code, class_code, short_subject, teacher] + padding[:11]))
+                data_lines.append(",".join(
+                    [day_char, period_str, class_code, csv_name, csv_name, full_subject, teacher,
+                     class_code, class_code, short_subject, teacher] + padding
+                ))
+    _write_cp932(os.path.join(output_dir, "時間割.csv"), short_lines)
+    _write_cp932(os.path.join(output_dir, "時間割data.csv"), data_lines)
+
+    # --- teacher_names.csv（実データと同じ UTF-8 BOM 付き） ---
+    with open(os.path.join(output_dir, "teacher_names.csv"), 'w', encoding='utf-8-sig', newline='') as f:
+        f.write("\n".join(f"t{i + 1:02d}_{teacher}" for i, teacher in enumerate(school["teachers"])) + "\n")
+
+def generate_weeks(output_dir, num_classes, num_weeks=1, first_week_start=datetime.date(2025, 4, 7), num_periods=6, seed=0):
+    """
+    num_weeks 週分のデータを output_dir/week_NN/ に書き出し、(週の開始日, ディレクトリ) のリストを返す。
+    """
+    school = make_school(num_classes, num_periods, seed)
+    weeks = []
+    for week_index in range(num_weeks):
+        week_start = first_week_start + datetime.timedelta(weeks=week_index)
+        week_dir = os.path.join(output_dir, f"week_{week_index + 1:02d}")
+        write_week(week_dir, school, week_start, make_week_lessons(school, week_index))
+        weeks.append((week_start, week_dir))
+    return weeks
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ベンチマーク用の合成時間割データを生成します。")
+    parser.add_argument("output_dir", help="出力先ディレクトリ")
+    parser.add_argument("--classes", type=int, default=18, help="クラス数 (既定: 18)")
+    parser.add_argument("--weeks", type=int, default=1, help="週数 (既定: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード (既定: 0)")
+    args = parser.parse_args(argv)
+
+    weeks = generate_weeks(args.output_dir, args.classes, args.weeks, seed=args.seed)
+    print(f"{args.classes} クラス × {len(weeks)} 週分のデータを {args.output_dir} に生成しました。")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import io
+import os
+import shutil
+import contextlib
+from python_scripts import data_parser
+from python_scripts import html_generator
+from python_scripts import bundle_generator
+from python_scripts import utils
+
+BACKFILL_STAGING_PREFIX = ".backfill_"
+
+def find_week_inputs(config_data, input_paths):
+    """
+    バックフィルの入力（ファイルまたはディレクトリ）を、1週ずつの (クラス一覧CSVのパス, 時間割data.csv のパス または None) に展開する。
+    - CSVファイル: その1週分のクラス一覧（先生別ページは生成しない）
+    - クラス一覧.csv を含むディレクトリ: その1週分のデータ一式（時間割data.csv があれば先生別ページも生成する）
+    - それ以外のディレクトリ: 中のディレクトリとCSVファイルを名前順に1週ずつ扱う
+    """
+    class_list_filename = config_data["class_list_csv_filename"]
+    records_filename = config_data["timetable_records_csv_filename"]
+
+    def week_dir_input(dir_path):
+        records_csv_path = os.path.join(dir_path, records_filename)
+        return (os.path.join(dir_path, class_list_filename), records_csv_path if os.path.isfile(records_csv_path) else None)
+
+    week_inputs = []
+    for input_path in input_paths:
+        if os.path.isfile(input_path):
+            week_inputs.append((input_path, None))
+        elif os.path.isfile(os.path.join(input_path, class_list_filename)):
+            week_inputs.append(week_dir_input(input_path))
+        elif os.path.isdir(input_path):
+            for entry in sorted(os.listdir(input_path)):
+                entry_path = os.path.join(input_path, entry)
+                if os.path.isfile(os.path.join(entry_path, class_list_filename)):
+                    week_inputs.append(week_dir_input(entry_path))
+                elif os.path.isfile(entry_path) and entry.lower().endswith(".csv"):
+                    week_inputs.append((entry_path, None))
+        else:
+            raise FileNotFoundError(f"エラー: バックフィルの入力 '{input_path}' が見つかりません。")
+    return week_inputs
+
+def _replace_week_dir(config_data, staging_dir, week_range_str):
+    """生成を終えたディレクトリを docs/<週> と差し替え、以前の内容は削除する"""
+    base_dir = config_data["github_pages_output_base_dir"]
+    week_dir = os.path.join(base_dir, week_range_str)
+    old_dir = os.path.join(base_dir, f"{BACKFILL_STAGING_PREFIX}{week_range_str}_old")
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir)
+    if os.path.exists(week_dir):
+        os.rename(week_dir, old_dir)
+    os.rename(staging_dir, week_dir)
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir)
+    return week_dir
+
+def generate_week(config_data, class_list_csv_path, records_csv_path, school_year,
+                  master_class_info_list, teacher_info_list, env):
+    """
+    1週分のクラス一覧を解析して docs/<週> に書き出し、(週範囲文字列, 出力ディレクトリ) を返す。
+    ページはいったん docs/.backfill_<週> に生成し、揃ってから差し替える。
+    """
+    class_list_week = data_parser.parse_class_list(
+        class_list_csv_path,
+        config_data["csv_encoding"],
+        config_data["csv_data_start_col_offset"],
+        config_data["num_periods_per_day"],
+        school_year
+    )
+    teacher_index = None
+    if records_csv_path and teacher_info_list:
+        teacher_index = data_parser.build_teacher_index(
+            records_csv_path, config_data["csv_encoding"], config_data["num_periods_per_day"], config_data["timetable_record_columns"]
+        )
+
+    week_range_str = class_list_week.week_range_str
+    staging_dir = os.path.join(config_data["github_pages_output_base_dir"], f"{BACKFILL_STAGING_PREFIX}{week_range_str}")
+    if os.path.exists(staging_dir):
+        shutil.rmtree(staging_dir)
+    html_generator.generate_all_htmls(
+        config_data, class_list_week, master_class_info_list, output_dir=staging_dir,
+        teacher_info_list=teacher_info_list, teacher_index=teacher_index, env=env
+    )
+    bundle_generator.generate_week_bundle(
+        config_data, class_list_week, master_class_info_list, staging_dir,
+        teacher_info_list=teacher_info_list, teacher_index=teacher_index
+    )
+    return week_range_str, _replace_week_dir(config_data, staging_dir, week_range_str)
+
+def _generate_week_quietly(config_data, week_input, school_year, master_class_info_list, teacher_info_list, env):
+    """
+    generate_week を実行し、(週範囲文字列, 出力ディレクトリ, ログ, エラー) を返す。
+    並列に実行した週のログが混ざらないよう、標準出力をまとめて返す。
+    """
+    class_list_csv_path, records_csv_path = week_input
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            week_range_str, week_dir = generate_week(
+                config_data, class_list_csv_path, records_csv_path, school_year,
+                master_class_info_list, teacher_info_list, env
+            )
+        except (FileNotFoundError, ValueError) as e:
+            return None, None, log.getvalue(), str(e)
+    return week_range_str, week_dir, log.getvalue(), None
+
+# ワーカープロセスごとに1回だけ用意する共有データ（設定、Class_names.csv、教師名、Jinja2環境）
+_worker_state = None
+
+def _init_batch_worker(config_data, school_year, master_class_info_list, teacher_info_list):
+    global _worker_state
+    env = html_generator.create_jinja2_env(config_data["templates_dir"], config_data.get("template_cache_dir"))
+    html_generator.load_page_templates(env)
+    _worker_state = (config_data, school_year, master_class_info_list, teacher_info_list, env)
+
+def _generate_week_in_worker(week_input):
+    config_data, school_year, master_class_info_list, teacher_info_list, env = _worker_state
+    return _generate_week_quietly(config_data, week_input, school_year, master_class_info_list, teacher_info_list, env)
+
+def _skip_duplicate_weeks(config_data, week_inputs, school_year):
+    """ヘッダーだけを読んで週を調べ、同じ週の入力が複数ある場合は最初の1つだけを残す"""
+    seen_weeks = {}
+    unique_inputs = []
+    for week_input in week_inputs:
+        try:
+            header_info = data_parser.parse_class_list_header(
+                week_input[0], config_data["csv_encoding"], config_data["csv_data_start_col_offset"],
+                config_data["num_periods_per_day"], school_year
+            )
+        except (FileNotFoundError, ValueError):
+            # 読み込めない入力は generate_week で改めて失敗として報告する
+            unique_inputs.append(week_input)
+            continue
+        week_range_str = header_info["week_range_str"]
+        if week_range_str in seen_weeks:
+            print(f"警告: '{week_input[0]}' は '{seen_weeks[week_range_str]}' と同じ週 ({week_range_str}) のためスキップします。")
+            continue
+        seen_weeks[week_range_str] = week_input[0]
+        unique_inputs.append(week_input)
+    return unique_inputs
+
+def run_backfill(config_data, input_paths, jobs=1, school_year=None):
+    """
+    複数週のクラス一覧を1つのプロセス（jobs が2以上なら週単位のワーカープロセス）でまとめて生成し、
+    それぞれを docs/<週> のアーカイブとして書き出す。latest とマニフェストは変更しない。
+    Class_names.csv・teacher_names.csv（config の data_dir）と Jinja2 環境は全週で共有する。
+    school_year を指定しない場合は今日を含む年度として、ヘッダーの日付に年を補う。
+    戻り値は失敗した週の数。
+    """
+    if school_year is None:
+        school_year = utils.get_school_year()
+
+    week_inputs = find_week_inputs(config_data, input_paths)
+    week_inputs = _skip_duplicate_weeks(config_data, week_inputs, school_year)
+    if not week_inputs:
+        print("バックフィルする週がありません。")
+        return 0
+
+    master_class_info_list = data_parser.load_class_names_list(
+        os.path.join(config_data["data_dir"], config_data["class_names_csv_filename"]), config_data["csv_encoding"]
+    )
+    teacher_info_list = None
+    teacher_names_csv_path = os.path.join(config_data["data_dir"], config_data["teacher_names_csv_filename"])
+    if os.path.exists(teacher_names_csv_path):
+        teacher_info_list = data_parser.load_teacher_info_list(teacher_names_csv_path, config_data["teacher_names_csv_encoding"])
+    os.makedirs(config_data["github_pages_output_base_dir"], exist_ok=True)
+
+    print(f"{len(week_inputs)} 週分の時間割を {school_year} 年度としてバックフィルします。")
+    if jobs <= 1 or len(week_inputs) <= 1:
+        _init_batch_worker(config_data, school_year, master_class_info_list, teacher_info_list)
+        results = [_generate_week_in_worker(week_input) for week_input in week_inputs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_batch_worker,
+            initargs=(config_data, school_year, master_class_info_list, teacher_info_list)
+        ) as executor:
+            results = list(executor.map(_generate_week_in_worker, week_inputs))
+
+    failures = 0
+    for week_input, (week_range_str, week_dir, log, error) in zip(week_inputs, results):
+        print(log, end="")
+        if error:
+            failures += 1
+            print(f"エラー: '{week_input[0]}' のバックフィルに失敗しました: {error}")
+            continue
+        print(f"{week_range_str} の時間割を {week_dir} に書き出しました。")
+
+    print(f"バックフィルが完了しました（成功 {len(week_inputs) - failures} 週、失敗 {failures} 週）。")
+    return failures
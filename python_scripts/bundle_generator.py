@@ -0,0 +1,177 @@
+import os
+import json
+import shutil
+import hashlib
+from python_scripts import timetable_engine
+
+BUNDLE_VERSION = 3
+
+class _StringTable:
+    """バンドル内で同じ文字列を1回だけ保存し、表のセルは番号で参照する"""
+
+    def __init__(self):
+        self.strings = [timetable_engine.EMPTY_LESSON_MARK]
+        self._ids = {timetable_engine.EMPTY_LESSON_MARK: 0}
+
+    def id_of(self, value):
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self._ids[value] = string_id
+            self.strings.append(value)
+        return string_id
+
+    def grid(self, period_rows):
+        return [[self.id_of(lesson) for lesson in lessons_for_period] for lessons_for_period in period_rows]
+
+def _slot_masks(lessons, num_periods):
+    """
+    曜日ごとに、授業のある時限のビットを立てた整数のリストを返す（1限が最下位ビット）。
+    lessons は 曜日 → 時限 → 授業（クラスの科目、または先生の授業のリスト）で、空でない値を授業ありとする。
+    """
+    return [
+        sum(1 << period_index for period_index, lesson in enumerate(day_lessons[:num_periods]) if lesson)
+        for day_lessons in lessons
+    ]
+
+def _subject_masks(class_number, lessons, num_periods):
+    """1クラスの 科目 → [クラス番号, 曜日ごとの時限のビット...] の辞書を返す（索引の1クラス分）"""
+    subject_masks = {}
+    for day_index, day_lessons in enumerate(lessons):
+        for period_index, lesson in enumerate(day_lessons[:num_periods]):
+            if not lesson:
+                continue
+            masks = subject_masks.get(lesson)
+            if masks is None:
+                masks = subject_masks[lesson] = [class_number] + [0] * len(lessons)
+            masks[1 + day_index] |= 1 << period_index
+    return subject_masks
+
+class WeekBundleWriter:
+    """
+    週のバンドル（week.json）を、クラスと先生の表を1件ずつ追加しながら一時ファイルに書き出す。
+    表の一覧はメモリに持たず、索引だけを（クラスごとの科目数に比例する大きさで）持つ。書きながら内容のハッシュを計算し、
+    finish で前回のハッシュと同じなら既存の week.json をそのまま残す（ファイルを書き換えない）。
+    - classes / teachers: ページと同じ 時限 × 曜日 の表。セルは strings の番号（0 は "-"）
+    - index.subjects: 科目の strings の番号 → [[クラス番号, 曜日ごとの時限のビット...], ...]（前詰め前の実際のコマ）
+    - index.teachers: teachers と同じ順の、曜日ごとの授業のある時限のビット
+    時限のビットは1限が最下位ビット（_slot_masks）。ビューアは索引をそのまま検索に使い、表から作り直さない。
+    索引と、表の番号が決まってから書く strings はファイルの末尾に置く。
+    """
+
+    def __init__(self, path, class_list_week):
+        self.path = path
+        self._tmp_path = path + ".tmp"
+        self._num_periods = len(class_list_week.unique_periods)
+        self._string_table = _StringTable()
+        self._hash = hashlib.sha256()
+        self._num_entries = 0
+        self._subject_index = {}
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        self._write(_dump_compact({
+            "version": BUNDLE_VERSION,
+            "week": class_list_week.week_range_str,
+            "periods": class_list_week.unique_periods,
+            "days": class_list_week.header_dates_decoded[:5],
+        })[:-1] + ',"classes":[')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # finish まで進まなかった場合は一時ファイルを残さない
+        if not self._file.closed:
+            self._file.close()
+            os.remove(self._tmp_path)
+
+    def _write(self, text):
+        self._file.write(text)
+        self._hash.update(text.encode('utf-8'))
+
+    def _write_entry(self, entry):
+        self._write(("," if self._num_entries else "") + _dump_compact(entry))
+        self._num_entries += 1
+
+    def add_class(self, class_info, class_row):
+        """1クラス分の表を書き出す。Class_names.csv とクラス一覧.csv の対応は generate_all_htmls と同じく行の順序で取る"""
+        subject_masks = _subject_masks(self._num_entries, class_row.lessons, self._num_periods)
+        self._write_entry({
+            "name": class_info['name'],
+            "file": class_info['filename_base'],
+            "table": class_row.name,
+            "grid": self._string_table.grid(timetable_engine.compact_class_lessons(class_row.lessons, self._num_periods)),
+        })
+        for subject, masks in subject_masks.items():
+            self._subject_index.setdefault(str(self._string_table.id_of(subject)), []).append(masks)
+
+    def finish(self, teacher_info_list=None, teacher_index=None, previous_hash=None):
+        """
+        授業のある先生の表、索引と strings を書き出してファイルを閉じ、(内容のハッシュ, 書き込んだバイト数) を返す。
+        ハッシュが previous_hash と同じで week.json が残っていれば、書き込んだバイト数は 0 になる。
+        """
+        self._write('],"teachers":[')
+        self._num_entries = 0
+        teacher_slot_index = []
+        if teacher_info_list and teacher_index is not None:
+            for teacher_info in teacher_info_list:
+                day_slots = teacher_index.get(teacher_info['name'])
+                if day_slots is None:
+                    continue
+                self._write_entry({
+                    "name": teacher_info['name'],
+                    "file": teacher_info['filename_base'],
+                    "grid": self._string_table.grid(timetable_engine.teacher_period_rows(day_slots, self._num_periods)),
+                })
+                teacher_slot_index.append(_slot_masks(day_slots, self._num_periods))
+        self._write('],"index":' + _dump_compact({"subjects": self._subject_index, "teachers": teacher_slot_index}))
+        self._write(',"strings":' + _dump_compact(self._string_table.strings) + "}")
+        self._file.close()
+
+        bundle_hash = self._hash.hexdigest()
+        if bundle_hash == previous_hash and os.path.isfile(self.path):
+            os.remove(self._tmp_path)
+            return bundle_hash, 0
+        # ステージングの week.json は latest とハードリンクを共有していることがあるため、上書きせずに置き換える
+        os.replace(self._tmp_path, self.path)
+        return bundle_hash, os.path.getsize(self.path)
+
+def _dump_compact(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+def publish_static_files(config_data):
+    """
+    static のビューアとスタイルシートを docs 直下にコピーする（内容が同じファイルは何もしない）。
+    学校ごとに出力先が違っても、ページは自校の github_pages_base_url からスタイルシートを読み込める。
+    """
+    os.makedirs(config_data["github_pages_output_base_dir"], exist_ok=True)
+    for filename in [config_data["viewer_filename"]] + config_data["static_asset_filenames"]:
+        source_path = os.path.join(config_data["static_dir"], filename)
+        destination_path = os.path.join(config_data["github_pages_output_base_dir"], filename)
+        if os.path.exists(destination_path):
+            with open(source_path, 'rb') as source, open(destination_path, 'rb') as destination:
+                if source.read() == destination.read():
+                    continue
+        shutil.copyfile(source_path, destination_path)
+        print(f"{filename} を {destination_path} に配置しました。")
+
+def generate_week_bundle(config_data, class_list_week, master_class_info_list, output_dir,
+                         teacher_info_list=None, teacher_index=None, previous_hash=None):
+    """
+    generate_all_htmls と同じ入力から、週のバンドル（week.json）を output_dir に書き出し、内容のハッシュを返す。
+    previous_hash（前回のマニフェストの値）と同じ内容なら既存のファイルを書き換えない。
+    docs 直下のビューアは viewer.html?week=<週> でアーカイブの週も表示できる。
+    """
+    bundle_path = os.path.join(output_dir, config_data["week_bundle_filename"])
+    os.makedirs(output_dir, exist_ok=True)
+    with WeekBundleWriter(bundle_path, class_list_week) as writer:
+        for class_info, class_row in zip(master_class_info_list, class_list_week.class_rows):
+            writer.add_class(class_info, class_row)
+        bundle_hash, bytes_written = writer.finish(teacher_info_list, teacher_index, previous_hash)
+    if bytes_written:
+        print(f"週のバンドルを {bundle_path} に生成しました（{bytes_written} バイト）。")
+    else:
+        print(f"週のバンドル {bundle_path} は変更がないためスキップしました。")
+    publish_static_files(config_data)
+    return bundle_hash
@@ -1,4 +1,5 @@
 import os
+import json
 import datetime
 
 def load_config():
@@ -13,13 +14,85 @@ def load_config():
         "project_root": project_root,
         "data_dir": os.path.join(project_root, "data"),
         "templates_dir": os.path.join(project_root, "python_scripts", "templates"),
+        # コンパイル済みテンプレート（Jinja2 のバイトコード）のキャッシュ。次回以降の起動でテンプレートの解析を省く
+        "template_cache_dir": os.path.join(project_root, ".cache", "jinja2"),
         "github_pages_output_base_dir": os.path.join(project_root, "docs"),
+        "static_dir": os.path.join(project_root, "static"),
+        # 週ごとの時間割データ（ビューア用のJSON）と、docs 直下に置くビューアのファイル名
+        "week_bundle_filename": "week.json",
+        "viewer_filename": "viewer.html",
+        # static_dir から docs 直下にコピーするスタイルシート（ページは github_pages_base_url からの相対で参照する）
+        "static_asset_filenames": ["style.css", "print.css"],
+        # 公開先のURL（末尾は "/"）。ページのスタイルシートもここから読み込む
         "github_pages_base_url": "https://hanzawah.github.io/TimeTableMake/",
         "csv_encoding": "cp932",
         "class_list_csv_filename": "クラス一覧.csv",
         "class_names_csv_filename": "Class_names.csv",
         "teacher_names_csv_filename": "teacher_names.csv",
+        "teacher_names_csv_encoding": "utf-8-sig",
+        "timetable_records_csv_filename": "時間割data.csv",
+        # validate でクラス一覧.csv と突き合わせる先生別の時間割（なければ突き合わせない）
+        "teacher_timetable_csv_filename": "先生時間割.csv",
+        # 先生時間割.csv のクラス略号の末尾 → クラス名の末尾（例: "3ｺ" → "3国探"、"32" は "3-2"）
+        "teacher_class_code_suffixes": {"ｺ": "国探", "ﾘ": "理探"},
+        # 時間割data.csv の各項目の列番号（科目は略称、教師は teacher_names.csv と同じ正式名の列）
+        "timetable_record_columns": {"day": 0, "period": 1, "class_name": 3, "room": 4, "subject": 9, "teacher": 6},
+        # 1人の教師が複数の教室をまとめて担当する学年行事・合同授業の科目。validate の教師の重複割り当てから除く。
+        # 科目名は学校ごとに異なるため既定は空（学校ごとの設定で指定する。load_tenant_configs の例を参照）
+        "double_booking_exempt_subjects": [],
         "default_week_range_str": default_week_range_str,
         "num_periods_per_day": 6,
         "csv_data_start_col_offset": 1,
-    }
\ No newline at end of file
+        # True ならクラス一覧.csv のデータ行を ClassRow としてメモリに保持せず、ページの生成中に1行ずつ解析する
+        "stream_class_rows": True,
+    }
+
+def load_tenant_configs(tenants_path):
+    """
+    複数校をまとめて生成するための設定ファイル（JSON）を読み込み、(学校名, 設定) のリストを返す。
+    形式: {"tenants": [{"name": "school-a", "data_dir": "school-a/data", "github_pages_output_base_dir": "school-a/docs",
+                         "github_pages_base_url": "https://...", "num_periods_per_day": 7,
+                         "double_booking_exempt_subjects": ["調査", "鑑賞", "英試"]}, ...]}
+    各学校の項目は load_config() の既定値を上書きし、値の型は既定値と同じでなければならない。
+    _dir で終わる項目の相対パスは設定ファイルのディレクトリを基準にする。
+    """
+    try:
+        with open(tenants_path, 'r', encoding='utf-8') as f:
+            tenants = json.load(f)["tenants"]
+    except FileNotFoundError:
+        raise FileNotFoundError(f"エラー: 学校の設定ファイル '{tenants_path}' が見つかりません。")
+    except Exception as e:
+        raise ValueError(f"エラー: 学校の設定ファイル '{tenants_path}' の読み込み中に問題が発生しました: {e}")
+    if not isinstance(tenants, list):
+        raise ValueError(f"エラー: 学校の設定ファイル '{tenants_path}' の tenants が配列ではありません。")
+
+    base_dir = os.path.dirname(os.path.abspath(tenants_path))
+    tenant_configs = []
+    seen_names = set()
+    for position, tenant in enumerate(tenants, start=1):
+        if not isinstance(tenant, dict):
+            raise ValueError(f"エラー: 学校の設定ファイル '{tenants_path}' の {position} 件目がオブジェクトではありません: {tenant!r}")
+        name = tenant.get("name")
+        if not isinstance(name, str) or not name or name in seen_names:
+            raise ValueError(f"エラー: 学校の設定ファイル '{tenants_path}' の name が空か重複しています: {name!r}")
+        seen_names.add(name)
+
+        cfg = load_config()
+        for key, value in tenant.items():
+            if key == "name":
+                continue
+            if key not in cfg:
+                raise ValueError(f"エラー: 学校 '{name}' の設定に不明な項目 '{key}' があります。")
+            expected_type = type(cfg[key])
+            # JSON の true/false は int としても受け付けてしまうため、bool は別に判定する
+            if not isinstance(value, expected_type) or (isinstance(value, bool) and expected_type is not bool):
+                raise ValueError(
+                    f"エラー: 学校 '{name}' の設定の '{key}' は {expected_type.__name__} で指定してください: {value!r}"
+                )
+            if key.endswith("_dir"):
+                value = os.path.normpath(os.path.join(base_dir, value))
+            if key == "github_pages_base_url" and not value.endswith("/"):
+                value += "/"
+            cfg[key] = value
+        tenant_configs.append((name, cfg))
+    return tenant_configs
@@ -1,78 +1,158 @@
-import pandas as pd
+import os
 import csv
 import re
 import datetime
+import unicodedata
+import functools
+import itertools
 from python_scripts import utils
 
-def parse_class_list_header(csv_path, encoding, csv_data_start_col_offset, num_periods_per_day_config):
+DAYS_OF_WEEK = ["月", "火", "水", "木", "金"]
+CLASS_LIST_HEADER_ROWS = 3
+
+class ClassRow:
     """
-    CSVファイルのヘッダーを解析する（最終FIX版）。
+    クラス一覧.csv の1クラス分のデータ。
+    lessons は曜日ごとの授業名タプルのタプル（lessons[曜日][時限]）で、空きコマは空文字列。
+    """
+    __slots__ = ("name", "lessons")
+
+    def __init__(self, name, lessons):
+        self.name = name
+        self.lessons = lessons
+
+    def __repr__(self):
+        return f"ClassRow({self.name!r})"
+
+class ClassListWeek:
+    """
+    クラス一覧.csv 1週分のメモリ内モデル。
+    ヘッダー情報（日付・時限・列マップ）とクラス行を保持する。
+    """
+    __slots__ = ("week_range_str", "unique_periods", "header_day_columns_map", "header_dates_decoded", "class_rows")
+
+    def __init__(self, week_range_str, unique_periods, header_day_columns_map, header_dates_decoded, class_rows):
+        self.week_range_str = week_range_str
+        self.unique_periods = unique_periods
+        self.header_day_columns_map = header_day_columns_map
+        self.header_dates_decoded = header_dates_decoded
+        self.class_rows = class_rows
+
+    def __len__(self):
+        return len(self.class_rows)
+
+    def header_info(self):
+        """parse_class_list_header と同じ形式の辞書を返す"""
+        return {
+            "week_range_str": self.week_range_str,
+            "unique_periods": self.unique_periods,
+            "header_day_columns_map": self.header_day_columns_map,
+            "header_dates_decoded": self.header_dates_decoded,
+        }
+
+def _build_header_info(date_row, csv_data_start_col_offset, num_periods_per_day_config, school_year=None):
+    """
+    ヘッダーの日付行から、時限・列マップ・日付文字列・週範囲文字列を計算する。
     日付と授業データの異なる列パターン（ストライド）を個別に正しく処理する。
-    授業データの列マッピングのストライドをデータ行の実際の構造に合わせる。
+    ヘッダーの日付には年がないため、school_year（年度）を指定した場合は1～3月を翌年として扱い、
+    指定しない場合は今日の年を使う。
+    """
+    unique_periods = [str(i) for i in range(1, num_periods_per_day_config + 1)]
+
+    # --- 1. 授業データの列インデックスを計算 ---
+    # データ行では、各曜日の授業データブロックは区切り列なしに連続している
+    # (例: 月曜6限の次が火曜1限)
+    # そのため、ストライドは1日の時限数そのものになる
+    header_day_columns_map = {}
+    current_lesson_col_idx = csv_data_start_col_offset # config.py から (通常は1)
+    lesson_stride = num_periods_per_day_config        # ★★★ 修正点 ★★★ (データ行の構造に合わせる)
+    for day_char in DAYS_OF_WEEK:
+        day_column_indices = list(range(current_lesson_col_idx, current_lesson_col_idx + num_periods_per_day_config))
+        header_day_columns_map[day_char] = day_column_indices
+        current_lesson_col_idx += lesson_stride
+
+    # --- 2. 日付ヘッダーの文字列を計算 ---
+    # CSVの2行目(日付行)では、日付は各曜日の先頭の列に配置 (6時限ならインデックス 1, 7, 13, 19, 25)
+    header_dates_decoded = []
+    current_date_col_idx = 1                    # 月曜日の日付は常にインデックス1から
+    date_stride = num_periods_per_day_config    # 日付間の実際の列の進み幅（1日の時限数）
+    for day_char in DAYS_OF_WEEK:
+        date_string_for_header = ""
+        if current_date_col_idx < len(date_row):
+            decoded_date_cell_value = date_row[current_date_col_idx].strip()
+            if re.search(r'\d{1,2}/\d{1,2}', decoded_date_cell_value):
+                date_string_for_header = decoded_date_cell_value
+
+        if not date_string_for_header:
+            date_string_for_header = f"({day_char})"
+
+        header_dates_decoded.append(date_string_for_header)
+        current_date_col_idx += date_stride
+
+    # --- 週範囲文字列の特定 ---
+    week_range_str = utils.get_week_range_string(datetime.date.today())
+    first_valid_date_entry = next((d for d in header_dates_decoded if re.search(r'\d{1,2}/\d{1,2}', d)), None)
+
+    if first_valid_date_entry:
+        date_part_match = re.search(r'(\d{1,2}/\d{1,2})', first_valid_date_entry)
+        if date_part_match:
+            date_part_str = date_part_match.group(1)
+            if school_year is None:
+                current_year = datetime.date.today().year
+            else:
+                current_year = utils.year_for_month_in_school_year(int(date_part_str.split('/')[0]), school_year)
+            try:
+                first_date_object = datetime.datetime.strptime(f"{current_year}/{date_part_str}", "%Y/%m/%d").date()
+                week_range_str = utils.get_week_range_string(first_date_object)
+            except ValueError:
+                 pass
+
+    return {
+        "week_range_str": week_range_str,
+        "unique_periods": unique_periods,
+        "header_day_columns_map": header_day_columns_map,
+        "header_dates_decoded": header_dates_decoded
+    }
+
+def _read_header_rows(reader, csv_path):
+    """readerから先頭3行のヘッダーを読み進め、日付行を返す"""
+    header_rows = []
+    for row in reader:
+        header_rows.append(row)
+        if len(header_rows) == CLASS_LIST_HEADER_ROWS:
+            return header_rows[1]
+    raise ValueError(f"CSVファイル '{csv_path}' は少なくとも3行のヘッダーが必要です。")
+
+def _class_row_from_csv_row(row, header_day_columns_map):
+    """CSVのデータ行1行を ClassRow に変換する（空白除去済み、空きコマは空文字列）"""
+    row_len = len(row)
+    lessons = tuple(
+        tuple(row[col].strip() if col < row_len else "" for col in header_day_columns_map[day_char])
+        for day_char in DAYS_OF_WEEK
+    )
+    return ClassRow(row[0].strip(), lessons)
+
+def _file_signature(stat_result):
+    """ファイルが保存し直されたかを判定するための (inode, サイズ, 更新時刻) を返す"""
+    return (stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+
+def _iter_class_rows(reader, header_day_columns_map):
+    """ヘッダーを読み進めた reader から、データ行を1行ずつ ClassRow にして返す"""
+    for row in reader:
+        # 空行は読み飛ばす
+        if not row:
+            continue
+        yield _class_row_from_csv_row(row, header_day_columns_map)
+
+def parse_class_list_header(csv_path, encoding, csv_data_start_col_offset, num_periods_per_day_config, school_year=None):
+    """
+    CSVファイルのヘッダーを解析する（最終FIX版）。
+    先頭3行だけを読み込み、データ行は読まない。
     """
     try:
-        with open(csv_path, 'r', encoding='cp932', newline='') as f:
-            reader = csv.reader(f)
-            rows = list(reader)
-            
-            if len(rows) < 3:
-                raise ValueError(f"CSVファイル '{csv_path}' は少なくとも3行のヘッダーが必要です。")
-
-            days_of_week = ["月", "火", "水", "木", "金"]
-            unique_periods = [str(i) for i in range(1, num_periods_per_day_config + 1)]
-            date_row = rows[1]
-            
-            # --- 1. 授業データの列インデックスを計算 ---
-            # データ行では、各曜日の授業データブロックは区切り列なしに連続している
-            # (例: 月曜6限の次が火曜1限)
-            # そのため、ストライドは1日の時限数そのものになる
-            header_day_columns_map = {}
-            current_lesson_col_idx = csv_data_start_col_offset # config.py から (通常は1)
-            lesson_stride = num_periods_per_day_config        # ★★★ 修正点 ★★★ (データ行の構造に合わせる)
-            for day_char in days_of_week:
-                day_column_indices = list(range(current_lesson_col_idx, current_lesson_col_idx + num_periods_per_day_config))
-                header_day_columns_map[day_char] = day_column_indices
-                current_lesson_col_idx += lesson_stride
-
-            # --- 2. 日付ヘッダーの文字列を計算 ---
-            # CSVの2行目(日付行)では、日付はインデックス 1, 7, 13, 19, 25 に配置 (ストライド6)
-            header_dates_decoded = []
-            current_date_col_idx = 1  # 月曜日の日付は常にインデックス1から
-            date_stride = 6           # 日付間の実際の列の進み幅
-            for day_char in days_of_week:
-                date_string_for_header = ""
-                if current_date_col_idx < len(date_row):
-                    decoded_date_cell_value = date_row[current_date_col_idx].strip()
-                    if re.search(r'\d{1,2}/\d{1,2}', decoded_date_cell_value):
-                        date_string_for_header = decoded_date_cell_value
-                
-                if not date_string_for_header:
-                    date_string_for_header = f"({day_char})"
-                
-                header_dates_decoded.append(date_string_for_header)
-                current_date_col_idx += date_stride
-
-            # --- 週範囲文字列の特定 ---
-            week_range_str = utils.get_week_range_string(datetime.date.today())
-            first_valid_date_entry = next((d for d in header_dates_decoded if re.search(r'\d{1,2}/\d{1,2}', d)), None)
-
-            if first_valid_date_entry:
-                date_part_match = re.search(r'(\d{1,2}/\d{1,2})', first_valid_date_entry)
-                if date_part_match:
-                    date_part_str = date_part_match.group(1)
-                    current_year = datetime.date.today().year
-                    try:
-                        first_date_object = datetime.datetime.strptime(f"{current_year}/{date_part_str}", "%Y/%m/%d").date()
-                        week_range_str = utils.get_week_range_string(first_date_object)
-                    except ValueError:
-                         pass 
-            
-            return {
-                "week_range_str": week_range_str, 
-                "unique_periods": unique_periods, 
-                "header_day_columns_map": header_day_columns_map,
-                "header_dates_decoded": header_dates_decoded 
-            }
+        with open(csv_path, 'r', encoding=encoding, newline='') as f:
+            date_row = _read_header_rows(csv.reader(f), csv_path)
+            return _build_header_info(date_row, csv_data_start_col_offset, num_periods_per_day_config, school_year)
 
     except FileNotFoundError:
         raise FileNotFoundError(f"エラー: クラス一覧ファイル '{csv_path}' が見つかりません。")
@@ -82,24 +162,109 @@ def parse_class_list_header(csv_path, encoding, csv_data_start_col_offset, num_p
         print(traceback.format_exc())
         raise ValueError(f"エラー: クラス一覧ファイル '{csv_path}' のヘッダー読み込み中に問題が発生しました: {e}")
 
-def load_class_list_data_df(csv_path, encoding, skiprows):
+def parse_class_list(csv_path, encoding, csv_data_start_col_offset, num_periods_per_day_config, school_year=None):
+    """
+    クラス一覧.csv を1回のストリーミング読み込みで解析し、ClassListWeek を返す。
+    ヘッダー3行を解析した後、データ行を1行ずつ ClassRow に変換する。
+    school_year は週の年を決める年度（_build_header_info を参照）。
+    """
     try:
-        df = pd.read_csv(csv_path, encoding='cp932', header=None, skiprows=skiprows, sep=',', quotechar='"', skipinitialspace=True, engine='python')
-        return df
+        with open(csv_path, 'r', encoding=encoding, newline='') as f:
+            reader = csv.reader(f)
+            date_row = _read_header_rows(reader, csv_path)
+            header_info = _build_header_info(date_row, csv_data_start_col_offset, num_periods_per_day_config, school_year)
+            header_day_columns_map = header_info["header_day_columns_map"]
+            class_rows = list(_iter_class_rows(reader, header_day_columns_map))
+
+        return ClassListWeek(
+            header_info["week_range_str"],
+            header_info["unique_periods"],
+            header_day_columns_map,
+            header_info["header_dates_decoded"],
+            class_rows,
+        )
+
     except FileNotFoundError:
-        raise FileNotFoundError(f"エラー: クラス一覧ファイル '{csv_path}' のデータ部分が見つかりません。")
+        raise FileNotFoundError(f"エラー: クラス一覧ファイル '{csv_path}' が見つかりません。")
     except Exception as e:
-        raise ValueError(f"エラー: クラス一覧ファイル '{csv_path}' のデータ部分読み込み中に問題が発生しました: {e}")
+        import traceback
+        print("--- parse_class_list でエラーが発生しました ---")
+        print(traceback.format_exc())
+        raise ValueError(f"エラー: クラス一覧ファイル '{csv_path}' の読み込み中に問題が発生しました: {e}")
+
+class StreamedClassList:
+    """
+    クラス一覧.csv 1週分のモデル。ClassListWeek と同じ属性を持つが、ClassRow もファイルの内容もメモリに保持せず、
+    class_rows は参照するたびにファイルを開き直し、データ行を1行ずつ ClassRow にして返すイテレータになる。
+    ヘッダーを読んだときのファイルの状態（inode・サイズ・更新時刻）を記録し、データ行を読む前後で確かめるため、
+    生成中にファイルが保存し直された場合は、ヘッダーとデータ行・ページと週のバンドルが別の版から作られる前にエラーにする。
+    """
+    __slots__ = ("csv_path", "encoding", "_signature", "week_range_str", "unique_periods", "header_day_columns_map",
+                 "header_dates_decoded")
+
+    def __init__(self, csv_path, encoding, csv_data_start_col_offset, num_periods_per_day_config, school_year=None):
+        try:
+            with open(csv_path, 'r', encoding=encoding, newline='') as f:
+                self._signature = _file_signature(os.fstat(f.fileno()))
+                date_row = _read_header_rows(csv.reader(f), csv_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"エラー: クラス一覧ファイル '{csv_path}' が見つかりません。")
+        except (ValueError, csv.Error) as e:
+            raise ValueError(f"エラー: クラス一覧ファイル '{csv_path}' の読み込み中に問題が発生しました: {e}")
+        header_info = _build_header_info(date_row, csv_data_start_col_offset, num_periods_per_day_config, school_year)
+        self.csv_path = csv_path
+        self.encoding = encoding
+        self.week_range_str = header_info["week_range_str"]
+        self.unique_periods = header_info["unique_periods"]
+        self.header_day_columns_map = header_info["header_day_columns_map"]
+        self.header_dates_decoded = header_info["header_dates_decoded"]
+
+    @property
+    def class_rows(self):
+        return self._iter_class_rows()
+
+    def _check_unchanged(self, stat_result):
+        if _file_signature(stat_result) != self._signature:
+            raise ValueError(f"エラー: クラス一覧ファイル '{self.csv_path}' が読み込み中に変更されました。もう一度実行してください。")
+
+    def _iter_class_rows(self):
+        try:
+            with open(self.csv_path, 'r', encoding=self.encoding, newline='') as f:
+                self._check_unchanged(os.fstat(f.fileno()))
+                reader = csv.reader(f)
+                _read_header_rows(reader, self.csv_path)
+                yield from _iter_class_rows(reader, self.header_day_columns_map)
+            # 読み終えた後にも確かめ、読み込み中にその場で書き換えられた場合も途中の版を使わない
+            self._check_unchanged(os.stat(self.csv_path))
+        except FileNotFoundError:
+            raise ValueError(f"エラー: クラス一覧ファイル '{self.csv_path}' が読み込み中に削除されました。")
+        except csv.Error as e:
+            raise ValueError(f"エラー: クラス一覧ファイル '{self.csv_path}' の読み込み中に問題が発生しました: {e}")
+
+    def header_info(self):
+        """parse_class_list_header と同じ形式の辞書を返す"""
+        return {
+            "week_range_str": self.week_range_str,
+            "unique_periods": self.unique_periods,
+            "header_day_columns_map": self.header_day_columns_map,
+            "header_dates_decoded": self.header_dates_decoded,
+        }
 
 def load_class_names_list(csv_path, encoding):
+    """
+    Class_names.csv（1行1クラス、「表示名,ファイル名」）を読み込み、
+    [{'name': '3年1組', 'filename_base': 'C31'}, ...] を返す。空行と項目が欠けた行は読み飛ばす。
+    """
     try:
-        df = pd.read_csv(csv_path, encoding='cp932', header=None, names=['表示名', 'ファイル名'], engine='python')
         class_info_list = []
-        for index, row in df.iterrows():
-            display_name = str(row['表示名']).strip()
-            filename_base = str(row['ファイル名']).strip()
-            if display_name and filename_base:
-                class_info_list.append({'name': display_name, 'filename_base': filename_base})
+        with open(csv_path, 'r', encoding=encoding, newline='') as f:
+            for row in csv.reader(f):
+                if len(row) < 2:
+                    continue
+                display_name = row[0].strip()
+                filename_base = row[1].strip()
+                if display_name and filename_base:
+                    class_info_list.append({'name': display_name, 'filename_base': filename_base})
         return class_info_list
     except FileNotFoundError:
         raise FileNotFoundError(f"エラー: クラス名ファイル '{csv_path}' が見つかりません。")
@@ -107,12 +272,207 @@ def load_class_names_list(csv_path, encoding):
         raise ValueError(f"エラー: クラス名ファイル '{csv_path}' の読み込み中に問題が発生しました: {e}")
 
 def load_teacher_names_list(csv_path, encoding):
+    """教師名ファイル（1行1人）を読み込み、重複を除いた教師名のリストを出現順で返す"""
+    try:
+        teacher_names = {}
+        with open(csv_path, 'r', encoding=encoding, newline='') as f:
+            for row in csv.reader(f):
+                name = row[0].strip() if row else ""
+                if name:
+                    teacher_names.setdefault(name, None)
+        return list(teacher_names)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"エラー: 教師名ファイル '{csv_path}' が見つかりません。")
+    except Exception as e:
+        raise ValueError(f"エラー: 教師名ファイル '{csv_path}' の読み込み中に問題が発生しました: {e}")
+
+
+def load_teacher_info_list(csv_path, encoding):
+    """
+    teacher_names.csv（1行1人、"t01_奥山" のように「ファイル名_教師名」の形式）を読み込み、
+    [{'name': '奥山', 'filename_base': 't01'}, ...] を返す。
+    """
     try:
-        df = pd.read_csv(csv_path, encoding='cp932', header=None, names=['教師名'], engine='python')
-        teacher_names = [str(name).strip() for name in df['教師名'].dropna().unique() if str(name).strip()]
-        return teacher_names
+        teacher_info_list = []
+        with open(csv_path, 'r', encoding=encoding, newline='') as f:
+            for row in csv.reader(f):
+                if not row or not row[0].strip():
+                    continue
+                filename_base, separator, teacher_name = row[0].strip().partition('_')
+                if not separator or not teacher_name:
+                    raise ValueError(f"'{row[0]}' は「ファイル名_教師名」の形式ではありません。")
+                teacher_info_list.append({'name': teacher_name, 'filename_base': filename_base})
+        return teacher_info_list
     except FileNotFoundError:
         raise FileNotFoundError(f"エラー: 教師名ファイル '{csv_path}' が見つかりません。")
     except Exception as e:
         raise ValueError(f"エラー: 教師名ファイル '{csv_path}' の読み込み中に問題が発生しました: {e}")
 
+def build_teacher_index(csv_path, encoding, num_periods_per_day_config, record_columns):
+    """
+    時間割data.csv（1行1授業の曜日・時限・クラス・科目・教師のレコード）を1回だけ走査し、
+    教師名 → 曜日 → 時限 → 授業のリスト の索引を作る。
+    record_columns は config の timetable_record_columns（各項目の列番号）。
+    授業は「科目 クラス名」の文字列で保持し、同じコマの重複は除く。
+    """
+    day_col = record_columns["day"]
+    period_col = record_columns["period"]
+    class_col = record_columns["class_name"]
+    subject_col = record_columns["subject"]
+    teacher_col = record_columns["teacher"]
+    max_col = max(day_col, period_col, class_col, subject_col, teacher_col)
+    day_indices = {day_char: i for i, day_char in enumerate(DAYS_OF_WEEK)}
+
+    try:
+        teacher_index = {}
+        with open(csv_path, 'r', encoding=encoding, newline='') as f:
+            for row in csv.reader(f):
+                if len(row) <= max_col:
+                    continue
+                day_index = day_indices.get(row[day_col].strip())
+                period_str = unicodedata.normalize('NFKC', row[period_col]).strip()
+                teacher_name = row[teacher_col].strip()
+                if day_index is None or not period_str.isdigit() or not teacher_name:
+                    continue
+                period_index = int(period_str) - 1
+                if not 0 <= period_index < num_periods_per_day_config:
+                    continue
+
+                day_slots = teacher_index.get(teacher_name)
+                if day_slots is None:
+                    day_slots = [[[] for _ in range(num_periods_per_day_config)] for _ in DAYS_OF_WEEK]
+                    teacher_index[teacher_name] = day_slots
+                lesson = f"{row[subject_col].strip()} {row[class_col].strip()}".strip()
+                slot = day_slots[day_index][period_index]
+                if lesson not in slot:
+                    slot.append(lesson)
+        return teacher_index
+    except FileNotFoundError:
+        raise FileNotFoundError(f"エラー: 時間割ファイル '{csv_path}' が見つかりません。")
+    except Exception as e:
+        raise ValueError(f"エラー: 時間割ファイル '{csv_path}' の読み込み中に問題が発生しました: {e}")
+
+TEACHER_BLOCK_MARK = "先生名"
+TEACHER_TOTAL_MARK = "合計時間"
+
+class TeacherGrid:
+    """
+    先生時間割.csv の1教師分のブロック。
+    lessons は lessons[曜日][時限] が (科目, クラス略号) のタプル、授業がなければ None。
+    """
+    __slots__ = ("name", "header_dates", "lessons", "total_hours")
+
+    def __init__(self, name, header_dates, lessons, total_hours):
+        self.name = name
+        self.header_dates = header_dates
+        self.lessons = lessons
+        self.total_hours = total_hours
+
+    def __repr__(self):
+        return f"TeacherGrid({self.name!r})"
+
+    def day_slots(self, class_name_by_code=None):
+        """
+        build_teacher_index の1教師分と同じ形（曜日 → 時限 → 授業のリスト）に変換する。
+        class_name_by_code（クラス略号 → クラス名）を指定すると、略号をクラス名に置き換える。
+        """
+        if class_name_by_code is None:
+            class_name_by_code = {}
+        return [
+            [
+                [] if lesson is None else [f"{lesson[0]} {class_name_by_code.get(lesson[1], lesson[1])}".strip()]
+                for lesson in day_lessons
+            ]
+            for day_lessons in self.lessons
+        ]
+
+def iter_teacher_blocks(csv_path, encoding):
+    """
+    先生時間割.csv を1行ずつ読み、"先生名" 行で始まるブロックごとに行のリストを返すジェネレータ。
+    ファイル全体をメモリに読み込まない。最初のブロックより前の行（タイトル行など）は読み飛ばす。
+    """
+    try:
+        with open(csv_path, 'r', encoding=encoding, newline='') as f:
+            block_rows = None
+            for row in csv.reader(f):
+                if row and row[0].strip() == TEACHER_BLOCK_MARK:
+                    if block_rows:
+                        yield block_rows
+                    block_rows = [row]
+                elif block_rows is not None:
+                    block_rows.append(row)
+            if block_rows:
+                yield block_rows
+    except FileNotFoundError:
+        raise FileNotFoundError(f"エラー: 先生時間割ファイル '{csv_path}' が見つかりません。")
+
+def parse_teacher_block(block_rows, num_periods_per_day_config):
+    """
+    1教師分のブロックを TeacherGrid に変換する。
+    ブロックは "先生名" 行、日付行、時限ごとの2行（科目の行・クラス略号の行）、"合計時間" 行からなる。
+    """
+    if len(block_rows) < 2 or len(block_rows[0]) < 2:
+        raise ValueError(f"先生名の行または日付行がありません: {block_rows[:1]}")
+    teacher_name = block_rows[0][1].strip()
+
+    date_row = block_rows[1]
+    header_dates = []
+    for day_index, day_char in enumerate(DAYS_OF_WEEK):
+        date_cell = date_row[day_index + 1].strip() if day_index + 1 < len(date_row) else ""
+        header_dates.append(date_cell or f"({day_char})")
+
+    lessons = [[None] * num_periods_per_day_config for _ in DAYS_OF_WEEK]
+    total_hours = None
+    row_index = 2
+    while row_index < len(block_rows):
+        row = block_rows[row_index]
+        first_cell = unicodedata.normalize('NFKC', row[0]).strip() if row else ""
+        if first_cell == TEACHER_TOTAL_MARK:
+            total_hours = int(row[1]) if len(row) > 1 and row[1].strip().isdigit() else None
+            row_index += 1
+            continue
+        if not first_cell.isdigit():
+            row_index += 1
+            continue
+
+        # 時限の行（科目）の次の行がクラス略号の行
+        period_index = int(first_cell) - 1
+        class_row = block_rows[row_index + 1] if row_index + 1 < len(block_rows) else []
+        if 0 <= period_index < num_periods_per_day_config:
+            for day_index in range(len(DAYS_OF_WEEK)):
+                col = day_index + 1
+                subject = row[col].strip() if col < len(row) else ""
+                class_code = class_row[col].strip() if col < len(class_row) else ""
+                if subject or class_code:
+                    lessons[day_index][period_index] = (subject, class_code)
+        row_index += 2
+
+    return TeacherGrid(teacher_name, header_dates, tuple(tuple(day) for day in lessons), total_hours)
+
+def parse_teacher_timetable(csv_path, encoding, num_periods_per_day_config, jobs=1, batch_size=256):
+    """
+    先生時間割.csv をブロック単位でストリーミングしながら解析し、TeacherGrid をファイル順に返すジェネレータ。
+    jobs が2以上の場合、batch_size 個ずつのブロックをプロセスプールで並列に解析する
+    （メモリ上に保持するのは1バッチ分のブロックだけ）。
+    """
+    parse_block = functools.partial(parse_teacher_block, num_periods_per_day_config=num_periods_per_day_config)
+    blocks = iter_teacher_blocks(csv_path, encoding)
+    try:
+        if jobs <= 1:
+            for block_rows in blocks:
+                yield parse_block(block_rows)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            while True:
+                batch = list(itertools.islice(blocks, batch_size))
+                if not batch:
+                    break
+                chunksize = max(1, len(batch) // (jobs * 4))
+                yield from executor.map(parse_block, batch, chunksize=chunksize)
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        raise ValueError(f"エラー: 先生時間割ファイル '{csv_path}' の読み込み中に問題が発生しました: {e}")
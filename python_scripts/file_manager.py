@@ -1,4 +1,5 @@
 import os
+import re
 import shutil
 
 def move_and_archive_files(config_data, week_range_str):
@@ -42,4 +43,133 @@ def move_and_archive_files(config_data, week_range_str):
                 os.rmdir(item_path)
 
     else:
-        print("アーカイブする古い時間割はありません。")
\ No newline at end of file
+        print("アーカイブする古い時間割はありません。")
+
+STAGING_DIRNAME = ".latest_staging"
+ARCHIVE_STAGING_DIRNAME = ".archive_staging"
+# 公開の差し替え中だけ、直前の latest を置いておくディレクトリ
+PREVIOUS_LATEST_DIRNAME = ".latest_previous"
+
+# index.html の <title> からその週を読み取る（index_template.html の書式）
+_INDEX_TITLE_PATTERN = re.compile(r"<title>時間割 \| (\d{4}-\d{2}-\d{2}_\d{2}-\d{2})</title>")
+
+def _link_or_copy_tree(src_dir, dst_dir):
+    """src_dir のファイルを dst_dir にハードリンクする（リンクできない場合はコピーする）"""
+    for dirpath, dirnames, filenames in os.walk(src_dir):
+        target_dir = os.path.join(dst_dir, os.path.relpath(dirpath, src_dir))
+        os.makedirs(target_dir, exist_ok=True)
+        for filename in filenames:
+            src_path = os.path.join(dirpath, filename)
+            dst_path = os.path.join(target_dir, filename)
+            try:
+                os.link(src_path, dst_path)
+            except OSError:
+                shutil.copy2(src_path, dst_path)
+
+def _index_week_range(site_dir):
+    """site_dir/index.html の <title> から週を読み取る。読み取れない場合は None を返す"""
+    try:
+        with open(os.path.join(site_dir, "index.html"), 'r', encoding='utf-8') as f:
+            match = _INDEX_TITLE_PATTERN.search(f.read())
+    except (OSError, UnicodeDecodeError):
+        return None
+    return match.group(1) if match else None
+
+def published_week_range(config_data):
+    """公開中の latest がどの週かを latest/index.html から読み取る。読み取れない場合は None を返す"""
+    return _index_week_range(os.path.join(config_data["github_pages_output_base_dir"], "latest"))
+
+def recover_interrupted_publish(config_data):
+    """
+    前回の公開が latest を退避した直後（新しい latest を置く前）に中断していた場合、退避した latest を元に戻す。
+    latest が揃っている場合に残っている退避先は、差し替え後の削除が中断したものなので削除する。
+    """
+    github_pages_output_base_dir = config_data["github_pages_output_base_dir"]
+    latest_output_dir = os.path.join(github_pages_output_base_dir, "latest")
+    previous_latest_dir = os.path.join(github_pages_output_base_dir, PREVIOUS_LATEST_DIRNAME)
+    if not os.path.isdir(previous_latest_dir):
+        return
+    if os.path.exists(latest_output_dir):
+        shutil.rmtree(previous_latest_dir)
+    else:
+        os.rename(previous_latest_dir, latest_output_dir)
+        print(f"中断した公開から {latest_output_dir} を元に戻しました。")
+
+def check_archive_target(config_data, archive_week_range_str):
+    """
+    アーカイブ先の docs/<週> を確認し、そのパスと、既にその週のアーカイブがあるかどうかを返す。
+    同じ週のアーカイブ（index.html の週が一致する）は、前回の実行や backfill で作成済みとして扱う。
+    別の内容のディレクトリがある場合は、上書きせずに FileExistsError を送出する。
+    """
+    archive_output_dir = os.path.join(config_data["github_pages_output_base_dir"], archive_week_range_str)
+    if not os.path.exists(archive_output_dir):
+        return archive_output_dir, False
+    if _index_week_range(archive_output_dir) == archive_week_range_str:
+        return archive_output_dir, True
+    raise FileExistsError(
+        f"エラー: アーカイブ先 '{archive_output_dir}' が既に存在し、{archive_week_range_str} の時間割ではありません。"
+        "既存のディレクトリを上書きしないよう、内容を確認して移動または削除してから再実行してください。"
+    )
+
+def prepare_staging_dir(config_data, seed_from_latest=False):
+    """
+    ステージングディレクトリ（docs/.latest_staging）を空の状態で用意し、そのパスを返す。
+    seed_from_latest が True の場合は、現在の latest の内容をハードリンクで取り込んでおく
+    （変更のないページを書き直さずに済むようにするため）。
+    """
+    github_pages_output_base_dir = config_data["github_pages_output_base_dir"]
+    latest_output_dir = os.path.join(github_pages_output_base_dir, "latest")
+    staging_dir = os.path.join(github_pages_output_base_dir, STAGING_DIRNAME)
+
+    # 前回の中断で残ったステージングは破棄する
+    if os.path.exists(staging_dir):
+        shutil.rmtree(staging_dir)
+
+    if seed_from_latest and os.path.isdir(latest_output_dir):
+        _link_or_copy_tree(latest_output_dir, staging_dir)
+    else:
+        os.makedirs(staging_dir)
+    return staging_dir
+
+def publish_staged_site(config_data, staging_dir, archive_week_range_str=None):
+    """
+    ステージングディレクトリを latest として公開する。
+    archive_week_range_str を指定した場合、現在の latest を docs/<archive_week_range_str> にハードリンクで
+    アーカイブしてから差し替える。同じ週のアーカイブが既にあればアーカイブは省き、
+    別の内容のディレクトリがある場合は何も変更せずに FileExistsError を送出する。
+    差し替えは latest の退避とステージングのリネームの2回だけで、ページ数によらず一定の時間で終わる。
+    latest が2つの週の混ざった状態になることはなく、退避の直後に中断しても次回の実行で元に戻す。
+    戻り値はアーカイブディレクトリのパス（アーカイブしなかった場合は None）。
+    """
+    github_pages_output_base_dir = config_data["github_pages_output_base_dir"]
+    latest_output_dir = os.path.join(github_pages_output_base_dir, "latest")
+    previous_latest_dir = os.path.join(github_pages_output_base_dir, PREVIOUS_LATEST_DIRNAME)
+    recover_interrupted_publish(config_data)
+
+    archive_output_dir = None
+    has_latest = os.path.isdir(latest_output_dir) and bool(os.listdir(latest_output_dir))
+    if has_latest and archive_week_range_str:
+        archive_output_dir, already_archived = check_archive_target(config_data, archive_week_range_str)
+        if already_archived:
+            print(f"{archive_output_dir} は既にアーカイブ済みのため、アーカイブを省きます。")
+        else:
+            # アーカイブは一時ディレクトリに揃えてからリネームし、途中で中断しても中途半端な週を残さない。
+            # 週をまたいだページの重複排除は行わない。各ページは <title> と <h1> に週を含むため、
+            # 時間割が同じでも週が違えば同じ内容にはならない（同じ内容のファイルは git が1つの blob として保存する）
+            archive_staging_dir = os.path.join(github_pages_output_base_dir, ARCHIVE_STAGING_DIRNAME)
+            if os.path.exists(archive_staging_dir):
+                shutil.rmtree(archive_staging_dir)
+            _link_or_copy_tree(latest_output_dir, archive_staging_dir)
+            os.rename(archive_staging_dir, archive_output_dir)
+            print(f"古い時間割を {archive_output_dir} にアーカイブしました。")
+    elif archive_week_range_str:
+        print("アーカイブする古い時間割はありません。")
+
+    if os.path.isdir(latest_output_dir):
+        os.rename(latest_output_dir, previous_latest_dir)
+        os.rename(staging_dir, latest_output_dir)
+        shutil.rmtree(previous_latest_dir)
+    else:
+        os.rename(staging_dir, latest_output_dir)
+    print(f"新しい時間割を {latest_output_dir} に公開しました。")
+    return archive_output_dir
@@ -1,81 +1,86 @@
 import os
-import re
-from jinja2 import Environment, FileSystemLoader
-import pandas as pd
+import time
+import itertools
+import contextlib
+from python_scripts import timetable_engine
+from python_scripts import manifest
+from python_scripts import utils
+from python_scripts import profiler as profiler_module
 
-def create_jinja2_env(templates_dir):
-    """Jinja2の環境をセットアップする"""
-    # このスクリプト(html_generator.py)の場所を基準にtemplatesディレクトリのパスを解決
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    return Environment(loader=FileSystemLoader(os.path.join(base_dir, templates_dir)))
+# 一度にレンダリング・書き出しするページ数の上限
+PAGE_BATCH_SIZE = 256
+
+PAGE_TEMPLATE_NAMES = ['index_template.html', 'class_template.html', 'teacher_template.html', 'timetable_table.html']
 
-def generate_timetable_table_html_from_class_csv(env, class_row, header_periods, header_day_columns_map, header_dates_decoded):
+def create_jinja2_env(templates_dir, cache_dir=None):
     """
-    クラスの1行データから時間割テーブルのHTMLを生成する。
-    授業を前方に詰めて表示するロジックを実装。
+    Jinja2の環境をセットアップする。
+    cache_dir を指定すると、コンパイル済みのテンプレートをそのディレクトリに保存し、
+    次回以降（並列生成のワーカープロセスを含む）はテンプレートの解析とコンパイルを省く。
     """
-    class_name = str(class_row.iloc[0]).strip() # クラス名を取得
-    day_headers = header_dates_decoded[:5]      # 表示する曜日のヘッダー（月～金）
-    days_of_week = ["月", "火", "水", "木", "金"] # 処理対象の曜日
-    num_periods = len(header_periods)           # 1日の時限数
-
-    # 1. 曜日ごとに、CSVに記載のままの授業データを抽出する
-    raw_daily_lessons = {}
-    for day_char in days_of_week:
-        lessons_for_day = []
-        if day_char in header_day_columns_map:
-            for col_index_in_csv in header_day_columns_map[day_char]:
-                lesson = "" # デフォルトは空文字列（授業なしを示す）
-                if col_index_in_csv < len(class_row): # CSVの列範囲内か確認
-                    lesson_val = class_row.iloc[col_index_in_csv]
-                    # NaNでなく、かつ空白除去後に何かしら文字が残る場合のみ授業名として採用
-                    if pd.notna(lesson_val) and str(lesson_val).strip():
-                        lesson = str(lesson_val).strip()
-                lessons_for_day.append(lesson)
-        else: # マップに曜日が存在しない場合（通常はありえないが念のため）
-            lessons_for_day = [""] * num_periods
-        raw_daily_lessons[day_char] = lessons_for_day
-    
-    # 2. 曜日ごとに授業を前方に「詰める」処理を行う
-    compacted_daily_lessons = {}
-    for day_char in days_of_week:
-        # 空文字列でない授業だけを抽出
-        actual_lessons = [lesson for lesson in raw_daily_lessons.get(day_char, []) if lesson]
-        
-        # 新しいリストを作成し、抽出した授業を前から配置
-        compacted_list = actual_lessons[:] # スライスでリストをコピー
-        
-        # 1日の時限数に満たない部分をハイフンで埋める
-        while len(compacted_list) < num_periods:
-            compacted_list.append("-")
-        
-        compacted_daily_lessons[day_char] = compacted_list[:num_periods] # 念のため時限数でスライス
+    # Jinja2 はページを生成するときだけ必要なため、validate などのコマンドでは読み込まない
+    from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 
-    # 3. Jinja2テンプレート用に、時限ごとのデータ構造に変換（テーブルの転置）
+    # このスクリプト(html_generator.py)の場所を基準にtemplatesディレクトリのパスを解決
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    bytecode_cache = None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    return Environment(loader=FileSystemLoader(os.path.join(base_dir, templates_dir)), bytecode_cache=bytecode_cache)
+
+def load_page_templates(env):
+    """ページ生成に使うテンプレートをまとめて読み込み（コンパイルし）、テンプレート名 → テンプレートの辞書を返す"""
+    return {name: env.get_template(name) for name in PAGE_TEMPLATE_NAMES}
+
+def _table_context(table_name, header_periods, header_dates_decoded, period_rows):
+    """timetable_table.html に渡す変数の辞書を作る"""
+    # Jinja2テンプレート用に、時限をキーとした辞書に変換する
     timetable_data = {}
-    # header_periods (['1', '2', ...]) を元に、正しい順序で時限データを構築
-    for i, period_str in enumerate(sorted(header_periods, key=int)): # 時限を数値としてソートしてループ
-        lessons_for_period = []
-        for day_char in days_of_week:
-            # compacted_daily_lessonsから該当曜日のi番目の授業を取得
-            # もし該当曜日のデータがないか、時限が不足している場合は"-"を追加
-            day_lessons = compacted_daily_lessons.get(day_char)
-            if day_lessons and i < len(day_lessons):
-                lessons_for_period.append(day_lessons[i])
-            else:
-                lessons_for_period.append("-") # データ不足時のフォールバック
+    for period_str, lessons_for_period in zip(sorted(header_periods, key=int), period_rows):
         timetable_data[period_str] = lessons_for_period
+    return {
+        "table_name": table_name,
+        "day_headers": header_dates_decoded[:5],    # 表示する曜日のヘッダー（月～金）
+        "timetable_data": timetable_data,           # 時限をキーとした辞書
+    }
 
-    # 4. テンプレートをレンダリングしてHTMLを返す
+def render_timetable_table_html(env, class_name, header_periods, header_dates_decoded, period_rows):
+    """
+    時限 × 曜日 の表（timetable_engine.compact_class_lessons の結果、
+    または timetable_engine.teacher_period_rows の結果）から時間割テーブルのHTMLを生成する。
+    ページの生成ではテーブルをページのテンプレートに include して1回でレンダリングするため、
+    この関数はテーブル単体が必要な場合にだけ使う。
+    """
     table_template = env.get_template('timetable_table.html')
-    return table_template.render(
-        class_name=class_name,
-        day_headers=day_headers,
-        timetable_data=timetable_data # 時限をキーとした辞書
-    )
-
-def generate_all_htmls(config_data, parsed_header_info, class_list_data_df, master_class_info_list):
-    """すべてのクラスのHTMLファイルと目次ページを生成する"""
+    return table_template.render(**_table_context(class_name, header_periods, header_dates_decoded, period_rows))
+
+def generate_timetable_table_html_from_class_csv(env, class_row, header_periods, header_dates_decoded):
+    """
+    クラスの1行データ（data_parser.ClassRow）から時間割テーブルのHTMLを生成する。
+    授業を前方に詰めて表示するロジックを実装。
+    """
+    period_rows = timetable_engine.compact_class_lessons(class_row.lessons, len(header_periods))
+    return render_timetable_table_html(env, class_row.name, header_periods, header_dates_decoded, period_rows)
+
+def generate_all_htmls(config_data, class_list_week, master_class_info_list, jobs=1, previous_page_hashes=None, output_dir=None,
+                       teacher_info_list=None, teacher_index=None, profiler=None, profile_dump_path=None, env=None,
+                       executor=None):
+    """
+    すべてのクラスのHTMLファイルと目次ページを生成する。
+    teacher_info_list と teacher_index（data_parser.build_teacher_index の結果）を指定した場合は、
+    先生ごとの時間割ページも teacher/ に生成する。
+    output_dir を指定しない場合は docs/latest に直接書き出す（通常はステージングディレクトリを指定する）。
+    jobs が2以上の場合、クラスページのレンダリングと書き出しを jobs 個のワーカープロセスで並列に行う。
+    previous_page_hashes（前回のマニフェストのページハッシュ）と入力のハッシュが一致し、
+    ファイルも残っているページは書き出しを省略する。output_dir の class/ と teacher/ にある今回の対象外のページは削除する。
+    profiler（profiler.Profiler）を指定すると各ページの時間と書き込みバイト数を記録し、
+    profile_dump_path を指定するとページのレンダリング・書き出し処理の cProfile 結果をそのパスに書き出す。
+    env（create_jinja2_env の結果）を指定すると、複数の週を生成するときにテンプレートを使い回す。
+    executor（page_executor のプロセスプール）を指定すると、watch モードのように生成のたびにプールを作り直さず使い回す。
+    プールを作った後にテンプレートが変更されていた場合、そのプールは使わずに今回だけのプールを作る。
+    戻り値は今回のページハッシュの辞書（latest からの相対パス → ハッシュ）。
+    """
     # templates_dir は config_data から取得する想定
     # create_jinja2_env に渡すパスは、このファイル(html_generator.py)からの相対パスではなく、
     # プロジェクトルートからの相対パスか、絶対パスであるべき。
@@ -84,22 +89,34 @@ def generate_all_htmls(config_data, parsed_header_info, class_list_data_df, mast
     # もし、html_generator.py と同じ階層に templates があるなら、'templates'だけで良い。
     # 状況に応じて env の初期化方法を調整してください。
     # 例: env = create_jinja2_env(os.path.join(os.path.dirname(__file__), 'templates'))
-    env = create_jinja2_env(config_data.get("templates_dir", "python_scripts/templates"))
+    templates_dir = config_data.get("templates_dir", "python_scripts/templates")
+    template_cache_dir = config_data.get("template_cache_dir")
+    if env is None:
+        env = create_jinja2_env(templates_dir, template_cache_dir)
+    templates = load_page_templates(env)
     
-    week_range_str = parsed_header_info["week_range_str"]
-    unique_periods = parsed_header_info["unique_periods"] # ['1', '2', '3', '4', '5', '6']など
-    header_day_columns_map = parsed_header_info["header_day_columns_map"]
-    header_dates_decoded = parsed_header_info["header_dates_decoded"] 
+    week_range_str = class_list_week.week_range_str
+    unique_periods = class_list_week.unique_periods # ['1', '2', '3', '4', '5', '6']など
+    header_dates_decoded = class_list_week.header_dates_decoded
+    class_rows = class_list_week.class_rows    # リスト、または1行ずつ解析するイテレータ
 
-    github_pages_output_base_dir = config_data["github_pages_output_base_dir"]
-    latest_output_dir = os.path.join(github_pages_output_base_dir, "latest")
-    
-    latest_class_dir = os.path.join(latest_output_dir, "class")
-    if not os.path.exists(latest_class_dir):
-        os.makedirs(latest_class_dir, exist_ok=True)
+    if output_dir is None:
+        output_dir = os.path.join(config_data["github_pages_output_base_dir"], "latest")
+
+    class_output_dir = os.path.join(output_dir, "class")
+    if not os.path.exists(class_output_dir):
+        os.makedirs(class_output_dir, exist_ok=True)
+
+    if previous_page_hashes is None:
+        previous_page_hashes = {}
+    if profiler is None:
+        profiler = profiler_module.NULL_PROFILER
+    page_hashes = {}
+    versions = manifest.template_versions(env, PAGE_TEMPLATE_NAMES)
+    if teacher_info_list is None or teacher_index is None:
+        teacher_info_list = []
 
     # --- 目次ページの生成 ---
-    index_template = env.get_template('index_template.html')
     class_links_for_index = []
     
     for class_info in master_class_info_list:
@@ -113,59 +130,313 @@ def generate_all_htmls(config_data, parsed_header_info, class_list_data_df, mast
             "filename": filename_html # 'C11.html' など、ファイル名のみ
         })
 
-    index_html_content = index_template.render(
-        week_range=week_range_str,
-        class_list=class_links_for_index,
-        github_pages_base_url=config_data["github_pages_base_url"]
-    )
-    index_html_path = os.path.join(latest_output_dir, "index.html")
-    with open(index_html_path, 'w', encoding='utf-8') as f:
-        f.write(index_html_content)
-    print(f"目次HTMLを {index_html_path} に生成しました。")
+    teacher_links_for_index = [
+        {"name": teacher_info['name'], "filename": f"{teacher_info['filename_base']}.html"}
+        for teacher_info in teacher_info_list
+    ]
+
+    index_html_path = os.path.join(output_dir, "index.html")
+    index_hash = manifest.compute_page_hash({
+        "week_range": week_range_str,
+        "class_list": class_links_for_index,
+        "teacher_list": teacher_links_for_index,
+        "github_pages_base_url": config_data["github_pages_base_url"],
+        "templates": versions['index_template.html'],
+    })
+    page_hashes["index.html"] = index_hash
+    if _is_page_unchanged(index_html_path, "index.html", index_hash, previous_page_hashes):
+        profiler.record_skipped_page()
+        print(f"目次HTML {index_html_path} は変更がないためスキップしました。")
+    else:
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        index_stats = {}
+        with profiler_module.track_page_peak(index_stats):
+            bytes_written = _dump_html_file(index_html_path, templates['index_template.html'].stream(
+                week_range=week_range_str,
+                class_list=class_links_for_index,
+                teacher_list=teacher_links_for_index,
+                github_pages_base_url=config_data["github_pages_base_url"]
+            ))
+        profiler.record_page(_page_stats("index.html", wall_started, cpu_started, bytes_written, index_stats))
+        print(f"目次HTMLを {index_html_path} に生成しました。")
 
     # --- 各クラスの時間割ページの生成 ---
-    class_template = env.get_template('class_template.html')
-    
-    for i, master_class_entry in enumerate(master_class_info_list):
-        class_name_display = master_class_entry['name']
-        filename_base = master_class_entry['filename_base']
-        filename_html = f"{filename_base}.html"
-        class_html_path = os.path.join(latest_class_dir, filename_html)
+    # クラス行は1行ずつ前詰めしてタスクにするため、class_rows がイテレータ（StreamedClassList）でも全体を保持しない
+    skipped_messages = []
+
+    def iter_class_pages():
+        """クラスページごとに (警告のリスト, タスク または None, スキップ時のログ) を返す"""
+        class_rows_iter = iter(class_rows)
+        num_class_rows = 0
+        for master_class_entry in master_class_info_list:
+            class_name_display = master_class_entry['name']
+            filename_base = master_class_entry['filename_base']
+            filename_html = f"{filename_base}.html"
+            class_html_path = os.path.join(class_output_dir, filename_html)
+
+            class_row_data = next(class_rows_iter, None)
+            if class_row_data is None:
+                skipped_messages.append(f"警告: Class_names.csv のクラス数 ({len(master_class_info_list)}) が クラス一覧.csv のデータ行数 ({num_class_rows}) を超えました。'{class_name_display}' の時間割生成をスキップします。")
+                continue
+            num_class_rows += 1
+
+            # CSV内のクラス名とマスターリストのクラス名比較の警告 (必要に応じてロジックを調整)
+            csv_class_name_in_row = class_row_data.name
+            # master_class_entry に 'internal_name' があればそれと比較、なければ表示名と比較
+            # この比較ロジックは、class_names.csv の内容とクラス一覧.csv のクラス名の書式に依存
+            expected_csv_name = master_class_entry.get('internal_name', class_name_display)
+            normalized_csv_name = utils.normalize_class_name(csv_class_name_in_row) # 全角・ハイフン・「年」「組」の表記を統一
+            normalized_master_name = utils.normalize_class_name(expected_csv_name)
+
+            warnings = []
+            if normalized_csv_name != normalized_master_name:
+                warnings.append(f"警告: クラス名不一致の可能性: 表示名='{class_name_display}', CSV名='{csv_class_name_in_row}'")
+
+            period_rows = timetable_engine.compact_class_lessons(class_row_data.lessons, len(unique_periods))
+            page_key = f"class/{filename_html}"
+            page_hash = manifest.compute_page_hash({
+                "week_range": week_range_str,
+                "class_name": class_name_display,
+                "csv_class_name": csv_class_name_in_row,
+                "periods": unique_periods,
+                "header_dates": header_dates_decoded[:5],
+                "lessons": period_rows,
+                "github_pages_base_url": config_data["github_pages_base_url"],
+                "templates": [versions['class_template.html'], versions['timetable_table.html']],
+            })
+            page_hashes[page_key] = page_hash
+            if _is_page_unchanged(class_html_path, page_key, page_hash, previous_page_hashes):
+                profiler.record_skipped_page()
+                yield warnings, None, f"{class_name_display} の時間割HTML {class_html_path} は変更がないためスキップしました。"
+                continue
+
+            yield warnings, {
+                "page_path": class_html_path,
+                "page_key": page_key,
+                "page_template": 'class_template.html',
+                "name_var": "class_name",
+                "week_range_str": week_range_str,
+                "display_name": class_name_display,
+                "table_name": csv_class_name_in_row,
+                "unique_periods": unique_periods,
+                "header_dates_decoded": header_dates_decoded,
+                "period_rows": period_rows,
+                "github_pages_base_url": config_data["github_pages_base_url"],
+            }, None
 
-        if i < len(class_list_data_df):
-            class_row_data = class_list_data_df.iloc[i]
-        else:
-            print(f"警告: Class_names.csv のクラス数 ({len(master_class_info_list)}) が クラス一覧.csv のデータ行数 ({len(class_list_data_df)}) を超えました。'{class_name_display}' の時間割生成をスキップします。")
+    # --- 各先生の時間割ページの生成 ---
+    if teacher_info_list:
+        teacher_output_dir = os.path.join(output_dir, "teacher")
+        os.makedirs(teacher_output_dir, exist_ok=True)
+    # 時間割data.csv には授業があるが teacher_names.csv にない先生は、ページを作れないため警告する
+    if teacher_index:
+        listed_teacher_names = {teacher_info['name'] for teacher_info in teacher_info_list}
+        for teacher_name in teacher_index:
+            if teacher_name not in listed_teacher_names:
+                print(f"警告: 時間割に授業がある '{teacher_name}' 先生が教師名ファイルにないため、ページを生成しません。")
+    empty_day_slots = [[[] for _ in unique_periods] for _ in header_dates_decoded[:5]]
+
+    def iter_teacher_pages():
+        """先生ページごとに (警告のリスト, タスク または None, スキップ時のログ) を返す"""
+        for teacher_info in teacher_info_list:
+            teacher_name = teacher_info['name']
+            filename_html = f"{teacher_info['filename_base']}.html"
+            teacher_html_path = os.path.join(teacher_output_dir, filename_html)
+
+            warnings = []
+            day_slots = teacher_index.get(teacher_name)
+            if day_slots is None:
+                warnings.append(f"警告: 時間割に '{teacher_name}' 先生の授業がありません。")
+                day_slots = empty_day_slots
+            period_rows = timetable_engine.teacher_period_rows(day_slots, len(unique_periods))
+
+            page_key = f"teacher/{filename_html}"
+            page_hash = manifest.compute_page_hash({
+                "week_range": week_range_str,
+                "teacher_name": teacher_name,
+                "periods": unique_periods,
+                "header_dates": header_dates_decoded[:5],
+                "lessons": period_rows,
+                "github_pages_base_url": config_data["github_pages_base_url"],
+                "templates": [versions['teacher_template.html'], versions['timetable_table.html']],
+            })
+            page_hashes[page_key] = page_hash
+            if _is_page_unchanged(teacher_html_path, page_key, page_hash, previous_page_hashes):
+                profiler.record_skipped_page()
+                yield warnings, None, f"{teacher_name}先生 の時間割HTML {teacher_html_path} は変更がないためスキップしました。"
+                continue
+
+            yield warnings, {
+                "page_path": teacher_html_path,
+                "page_key": page_key,
+                "page_template": 'teacher_template.html',
+                "name_var": "teacher_name",
+                "week_range_str": week_range_str,
+                "display_name": teacher_name,
+                "table_name": teacher_name,
+                "unique_periods": unique_periods,
+                "header_dates_decoded": header_dates_decoded,
+                "period_rows": period_rows,
+                "github_pages_base_url": config_data["github_pages_base_url"],
+            }, None
+
+    # ページは PAGE_BATCH_SIZE 件ずつレンダリング・書き出しし、メモリに持つページ数をクラス数によらず一定にする
+    page_profile = None
+    if profile_dump_path:
+        import cProfile
+        page_profile = cProfile.Profile()
+    pages = itertools.chain(iter_class_pages(), iter_teacher_pages())
+    # テンプレートの更新の確認は生成1回につき1回だけ行い、ワーカーはページごとに確認しない
+    if executor is not None and executor.template_versions == versions:
+        executor_context = contextlib.nullcontext(executor)
+    else:
+        executor_context = page_executor(templates_dir, template_cache_dir, jobs, profiler.trace_memory)
+    with executor_context as executor:
+        while True:
+            batch = list(itertools.islice(pages, PAGE_BATCH_SIZE))
+            if not batch:
+                break
+            page_tasks = [task for _, task, _ in batch if task is not None]
+            if page_profile is not None:
+                page_profile.enable()
+            results = iter(_run_page_tasks(templates, page_tasks, executor, jobs))
+            if page_profile is not None:
+                page_profile.disable()
+            # ログはワーカーの完了順ではなく、常にページの並び順で出力する
+            for warnings, task, message in batch:
+                for warning in warnings:
+                    print(warning)
+                if task is not None:
+                    message, page_stats = next(results)
+                    profiler.record_page(page_stats)
+                print(message)
+    if page_profile is not None:
+        page_profile.dump_stats(profile_dump_path)
+        print(f"ページ生成の cProfile 結果を {profile_dump_path} に書き出しました。")
+    for message in skipped_messages:
+        print(message)
+
+    # 今回は対象外になったページを削除する。--force やマニフェストがない場合でも、
+    # latest から引き継いだページが残らないよう、マニフェストではなく出力先のファイルを調べる
+    for page_dirname in ("class", "teacher"):
+        page_dir = os.path.join(output_dir, page_dirname)
+        if not os.path.isdir(page_dir):
             continue
-        
-        # CSV内のクラス名とマスターリストのクラス名比較の警告 (必要に応じてロジックを調整)
-        csv_class_name_in_row = str(class_row_data.iloc[0]).strip()
-        # master_class_entry に 'internal_name' があればそれと比較、なければ表示名と比較
-        # この比較ロジックは、class_names.csv の内容とクラス一覧.csv のクラス名の書式に依存
-        expected_csv_name = master_class_entry.get('internal_name', class_name_display)
-        normalized_csv_name = re.sub(r'[-－]', '-', csv_class_name_in_row) # ハイフン正規化
-        normalized_master_name = re.sub(r'[-－]', '-', expected_csv_name)
-
-        if normalized_csv_name != normalized_master_name:
-            print(f"警告: クラス名不一致の可能性: 表示名='{class_name_display}', CSV名='{csv_class_name_in_row}'")
-
-        timetable_table_html = generate_timetable_table_html_from_class_csv(
-            env,
-            class_row_data, 
-            unique_periods, 
-            header_day_columns_map, 
-            header_dates_decoded
-        )
-
-        class_html_content = class_template.render(
-            week_range=week_range_str,
-            class_name=class_name_display,
-            timetable_table_html=timetable_table_html,
-            github_pages_base_url=config_data["github_pages_base_url"]
-        )
-        with open(class_html_path, 'w', encoding='utf-8') as f:
-            f.write(class_html_content)
-        print(f"{class_name_display} の時間割HTMLを {class_html_path} に生成しました。")
+        for filename in sorted(os.listdir(page_dir)):
+            stale_path = os.path.join(page_dir, filename)
+            if filename.endswith(".html") and f"{page_dirname}/{filename}" not in page_hashes and os.path.isfile(stale_path):
+                os.remove(stale_path)
+                print(f"対象外になった {stale_path} を削除しました。")
 
     print("すべての時間割HTMLの生成が完了しました！")
+    return page_hashes
+
+def _dump_html_file(path, template_stream):
+    """
+    テンプレートのストリーム（Template.stream の戻り値）をファイルに直接書き出し、ページ全体の文字列は作らない。
+    ステージングの既存ファイルは latest とハードリンクを共有していることがあるため、
+    上書きせずに一度削除してから新しいファイルとして書き出す。
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        template_stream.dump(f)
+    return os.path.getsize(path)
+
+def _page_stats(page_key, wall_started, cpu_started, bytes_written, page_stats=None):
+    """1ページ分の計測結果。page_key は latest からの相対パス（ステージングのパスは公開後に残らないため）"""
+    page_stats = {} if page_stats is None else page_stats
+    page_stats.update({
+        "path": page_key,
+        "wall_seconds": time.perf_counter() - wall_started,
+        "cpu_seconds": time.process_time() - cpu_started,
+        "bytes": bytes_written,
+    })
+    return page_stats
+
+def _is_page_unchanged(page_path, page_key, page_hash, previous_page_hashes):
+    """前回と入力のハッシュが同じで、出力ファイルも残っていれば True"""
+    return previous_page_hashes.get(page_key) == page_hash and os.path.isfile(page_path)
+
+def page_context(task):
+    """
+    1ページ分のタスクから、ページのテンプレート（時間割テーブルを include する）に渡す変数の辞書を作る。
+    """
+    context = _table_context(task["table_name"], task["unique_periods"], task["header_dates_decoded"], task["period_rows"])
+    context["week_range"] = task["week_range_str"]
+    context["github_pages_base_url"] = task["github_pages_base_url"]
+    context[task["name_var"]] = task["display_name"]
+    return context
+
+def _render_and_write_page(templates, task):
+    """
+    1ページ分（クラスまたは先生）の時間割ページを1回のレンダリングでファイルに書き出し、
+    (ログ文字列, 計測結果の辞書) を返す。
+    """
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    page_stats = {}
+    with profiler_module.track_page_peak(page_stats):
+        page_stream = templates[task["page_template"]].stream(**page_context(task))
+        bytes_written = _dump_html_file(task["page_path"], page_stream)
+    _page_stats(task["page_key"], wall_started, cpu_started, bytes_written, page_stats)
+    if task["name_var"] == "teacher_name":
+        return f"{task['display_name']}先生 の時間割HTMLを {task['page_path']} に生成しました。", page_stats
+    return f"{task['display_name']} の時間割HTMLを {task['page_path']} に生成しました。", page_stats
+
+# ワーカープロセスごとに1回だけ読み込むテンプレート
+_worker_templates = None
+
+def _init_render_worker(templates_dir, template_cache_dir, trace_memory=False):
+    """
+    ワーカープロセスの初期化時に1回だけJinja2環境を構築し、ページのテンプレートを読み込む。
+    trace_memory が True なら、ページごとのピークメモリを計測するためワーカーでも tracemalloc を開始する。
+    Ctrl+C は親プロセスだけが受け取り、プールを終了する（待機中のワーカーがトレースバックを表示しないように）。
+    """
+    import signal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    global _worker_templates
+    _worker_templates = load_page_templates(create_jinja2_env(templates_dir, template_cache_dir))
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+
+def _render_and_write_page_in_worker(task):
+    # テンプレートの更新は確認しない。プールを作った後にテンプレートが変わった場合は、
+    # generate_all_htmls がそのプールを使わない（is_executor_current を参照）
+    return _render_and_write_page(_worker_templates, task)
+
+@contextlib.contextmanager
+def page_executor(templates_dir, template_cache_dir, jobs, trace_memory=False):
+    """
+    jobs が2以上ならページ生成用のプロセスプールを、そうでなければ None を返す。
+    generate_all_htmls の executor に渡すと、複数回の生成で同じワーカーを使い回せる。
+    ワーカーはテンプレートを起動時に1回だけ読み込むため、プールには作成時のテンプレートのハッシュを記録する。
+    """
+    if jobs <= 1:
+        yield None
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    versions = manifest.template_versions(create_jinja2_env(templates_dir, template_cache_dir), PAGE_TEMPLATE_NAMES)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_render_worker,
+                             initargs=(templates_dir, template_cache_dir, trace_memory)) as executor:
+        executor.template_versions = versions
+        yield executor
+
+def is_executor_current(executor, env):
+    """page_executor のプールが、env の現在のテンプレートで作られたものなら True を返す（プールがない場合も True）"""
+    return executor is None or executor.template_versions == manifest.template_versions(env, PAGE_TEMPLATE_NAMES)
+
+def _run_page_tasks(templates, page_tasks, executor, jobs):
+    """
+    時間割ページのレンダリングと書き出しを実行し、(ログ文字列, 計測結果) をタスク順のリストで返す。
+    executor（page_executor のプロセスプール）があれば並列に実行する。ワーカーはバイトコードキャッシュからテンプレートを読み込む。
+    """
+    if executor is None or len(page_tasks) <= 1:
+        return [_render_and_write_page(templates, task) for task in page_tasks]
 
+    chunksize = max(1, len(page_tasks) // (jobs * 4))
+    return list(executor.map(_render_and_write_page_in_worker, page_tasks, chunksize=chunksize))
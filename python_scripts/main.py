@@ -1,42 +1,267 @@
+import io
 import os
 import sys
+import argparse
+import contextlib
 import datetime 
+import time
 
+# --profile でインポートにかかった時間も報告できるよう、パッケージの読み込み前に時刻を記録する
+_import_started = time.perf_counter()
 from python_scripts import config
 from python_scripts import data_parser
 from python_scripts import html_generator
-from python_scripts import file_manager
+from python_scripts import validator
+from python_scripts import profiler
+from python_scripts import pipeline
+from python_scripts import batch
+from python_scripts import watcher
+from python_scripts import tenants
+IMPORT_SECONDS = time.perf_counter() - _import_started
 
-def main():
+COMMANDS = ("generate", "validate", "backfill", "watch", "tenants")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="クラス一覧.csv から時間割HTMLを生成します。")
+    parser.add_argument(
+        "command", nargs="?", default="generate", choices=COMMANDS,
+        help="実行する処理 (既定: generate)。validate は公開前のデータ検査、"
+             "backfill は複数週のクラス一覧から docs/<週> のアーカイブを一括生成、"
+             "watch は data_dir の変更を監視して latest を更新し続ける、"
+             "tenants は設定ファイル（JSON）に並べた複数校をまとめて生成する"
+    )
+    parser.add_argument(
+        "inputs", nargs="*",
+        help="backfill の入力（週ごとのクラス一覧CSV、週ごとのデータディレクトリ、またはそれらを含むディレクトリ）、"
+             "または tenants の設定ファイル"
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1,
+        help="クラスページのレンダリング・書き出し（backfill では週、tenants では学校の生成）に使うワーカープロセス数 (既定: 1)"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="マニフェストを無視して、すべてのページを再生成する"
+    )
+    parser.add_argument(
+        "--school-year", type=int, default=None,
+        help="クラス一覧のヘッダーの日付に補う年度 (1～3月は翌年として扱う)。"
+             "既定: generate は今日の年、backfill は今日を含む年度"
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=0.1,
+        help="watch でファイルの変更を調べる間隔（秒、既定: 0.1）"
+    )
+    parser.add_argument(
+        "--debounce", type=float, default=0.2,
+        help="watch で保存が続く間は待ち、この秒数だけ変更がなくなってから生成する (既定: 0.2)"
+    )
+    parser.add_argument(
+        "--data-dir", default=None,
+        help="入力CSVのディレクトリ (既定: config の data_dir)"
+    )
+    parser.add_argument(
+        "--output-dir", default=None,
+        help="latest と週アーカイブを置くディレクトリ (既定: config の github_pages_output_base_dir)"
+    )
+    parser.add_argument(
+        "--report-json", metavar="PATH", default=None,
+        help="tenants の学校別の結果をJSONとして PATH に書き出す"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="フェーズ別・ページ別の実行時間、CPU時間、ピークメモリ、書き込みバイト数を表示する"
+    )
+    parser.add_argument(
+        "--trace-json", metavar="PATH", default=None,
+        help="計測結果を機械可読なJSONとして PATH に書き出す"
+    )
+    parser.add_argument(
+        "--profile-dump", metavar="PATH", default=None,
+        help="ページのレンダリング・書き出しを cProfile で計測し、PATH に保存する (--jobs 1 のときのみ)"
+    )
+    args = parser.parse_args(argv)
+    if args.inputs and args.command not in ("backfill", "tenants"):
+        parser.error(f"入力ファイルを指定できるのは backfill と tenants だけです: {' '.join(args.inputs)}")
+    if args.command == "backfill" and not args.inputs:
+        parser.error("backfill には入力ファイルまたはディレクトリを指定してください。")
+    if args.command == "tenants" and len(args.inputs) != 1:
+        parser.error("tenants には学校の設定ファイルを1つ指定してください。")
+    if args.profile_dump and args.jobs > 1:
+        # cProfile で計測できるのは親プロセスだけで、ワーカーでのレンダリングは結果に含まれない
+        parser.error("--profile-dump は --jobs 1 のときだけ指定できます。")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
     cfg = config.load_config()
+    if args.data_dir:
+        cfg["data_dir"] = os.path.abspath(args.data_dir)
+    if args.output_dir:
+        cfg["github_pages_output_base_dir"] = os.path.abspath(args.output_dir)
 
+    if args.command == "generate":
+        run_generate(cfg, args)
+    elif args.command == "validate":
+        run_validate(cfg)
+    elif args.command == "backfill":
+        run_backfill(cfg, args)
+    elif args.command == "watch":
+        run_watch(cfg, args)
+    elif args.command == "tenants":
+        run_tenants(args)
+
+def load_class_data(cfg, school_year=None):
+    """クラス一覧.csv と Class_names.csv を読み込む。読み込めない場合は終了する"""
     try:
-        parsed_header_info = data_parser.parse_class_list_header(
-            os.path.join(cfg["data_dir"], cfg["class_list_csv_filename"]), 
-            cfg["csv_encoding"],
-            cfg["csv_data_start_col_offset"], 
-            cfg["num_periods_per_day"]
-        )
-        
-        class_list_data_df = data_parser.load_class_list_data_df(
-            os.path.join(cfg["data_dir"], cfg["class_list_csv_filename"]), 
-            cfg["csv_encoding"], 
-            skiprows=3
-        )
+        return pipeline.load_class_data(cfg, school_year)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"エラー: データの読み込み中に問題が発生しました: {e}")
+        sys.exit(1)
 
-        master_class_info_list = data_parser.load_class_names_list(
-            os.path.join(cfg["data_dir"], cfg["class_names_csv_filename"]), cfg["csv_encoding"]
-        )
+def run_validate(cfg):
+    """時間割data.csv とクラスの対応を検査し、問題があれば終了コード1で終了する"""
+    class_list_week, master_class_info_list = load_class_data(cfg)
+    try:
+        report = validator.validate(cfg, class_list_week, master_class_info_list)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"エラー: データの読み込み中に問題が発生しました: {e}")
+        sys.exit(1)
+    if validator.print_report(report):
+        sys.exit(1)
+
+def run_generate(cfg, args):
+    # sys.exit で終了する場合も、計測用に開始した tracemalloc を止める
+    with profiler.Profiler(enabled=args.profile or bool(args.trace_json)) as prof:
+        prof.add_phase("import", IMPORT_SECONDS)
+
+        with prof.phase("load_class_data"):
+            class_list_week, master_class_info_list = load_class_data(cfg, args.school_year)
+        with prof.phase("load_teacher_data"):
+            try:
+                teacher_info_list, teacher_index = pipeline.load_teacher_data(cfg)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"エラー: データの読み込み中に問題が発生しました: {e}")
+                sys.exit(1)
 
+        try:
+            pipeline.publish_site(
+                cfg, class_list_week, master_class_info_list, teacher_info_list, teacher_index,
+                jobs=args.jobs, force=args.force, prof=prof, profile_dump_path=args.profile_dump
+            )
+        except (FileNotFoundError, FileExistsError, ValueError) as e:
+            # クラス一覧.csv のデータ行は生成中に解析するため、行の解析エラーもここで報告する
+            print(f"エラー: ページの生成中に問題が発生しました: {e}")
+            sys.exit(1)
+
+        print("すべての処理が完了しました！")
+        if args.profile:
+            prof.print_summary()
+        if args.trace_json:
+            prof.write_json(args.trace_json)
+
+def run_backfill(cfg, args):
+    """複数週のクラス一覧から docs/<週> のアーカイブを一括生成し、失敗した週があれば終了コード1で終了する"""
+    try:
+        failures = batch.run_backfill(cfg, args.inputs, jobs=args.jobs, school_year=args.school_year)
     except (FileNotFoundError, ValueError) as e:
         print(f"エラー: データの読み込み中に問題が発生しました: {e}")
         sys.exit(1)
+    if failures:
+        sys.exit(1)
 
-    file_manager.move_and_archive_files(cfg, parsed_header_info["week_range_str"])
+def run_tenants(args):
+    """設定ファイルの各学校を並行して生成し、結果の要約を表示する。失敗した学校があれば終了コード1で終了する"""
+    try:
+        tenant_configs = config.load_tenant_configs(args.inputs[0])
+    except (FileNotFoundError, ValueError) as e:
+        print(e)
+        sys.exit(1)
+    print(f"{len(tenant_configs)} 校の時間割を最大 {max(args.jobs, 1)} 並列で生成します。")
+    results = tenants.run_tenants(tenant_configs, jobs=args.jobs, force=args.force)
+    failures = tenants.print_summary(results)
+    if args.report_json:
+        tenants.write_report(args.report_json, results)
+    if failures:
+        sys.exit(1)
 
-    html_generator.generate_all_htmls(cfg, parsed_header_info, class_list_data_df, master_class_info_list)
+def run_watch(cfg, args):
+    """
+    data_dir の入力ファイルをポーリングで監視し、保存されるたびに latest を更新する。Ctrl+C で終了する。
+    Jinja2環境、--jobs 2 以上のときのワーカープロセス、変更のなかったファイルの読み込み結果はメモリに保持して使い回し、
+    書き出すのはマニフェストのハッシュが変わったページだけにする。
+    """
+    class_list_csv_path = os.path.join(cfg["data_dir"], cfg["class_list_csv_filename"])
+    class_names_csv_path = os.path.join(cfg["data_dir"], cfg["class_names_csv_filename"])
+    records_csv_path = os.path.join(cfg["data_dir"], cfg["timetable_records_csv_filename"])
+    teacher_names_csv_path = os.path.join(cfg["data_dir"], cfg["teacher_names_csv_filename"])
+    env = html_generator.create_jinja2_env(cfg["templates_dir"], cfg.get("template_cache_dir"))
+    cache = watcher.FileCache()
 
-    print("すべての処理が完了しました！")
+    def load_inputs():
+        class_list_week = cache.load(class_list_csv_path, lambda path: data_parser.parse_class_list(
+            path, cfg["csv_encoding"], cfg["csv_data_start_col_offset"], cfg["num_periods_per_day"], args.school_year
+        ))
+        master_class_info_list = cache.load(
+            class_names_csv_path, lambda path: data_parser.load_class_names_list(path, cfg["csv_encoding"])
+        )
+        if not os.path.exists(records_csv_path):
+            return class_list_week, master_class_info_list, None, None
+        teacher_info_list = cache.load(
+            teacher_names_csv_path, lambda path: data_parser.load_teacher_info_list(path, cfg["teacher_names_csv_encoding"])
+        )
+        teacher_index = cache.load(records_csv_path, lambda path: data_parser.build_teacher_index(
+            path, cfg["csv_encoding"], cfg["num_periods_per_day"], cfg["timetable_record_columns"]
+        ))
+        return class_list_week, master_class_info_list, teacher_info_list, teacher_index
+
+    # ワーカープロセスは生成のたびに起動し直さず、テンプレートが変更されたときだけプールを作り直す
+    pool_stack = contextlib.ExitStack()
+    executor = None
+
+    def current_executor():
+        nonlocal executor
+        if args.jobs <= 1:
+            return None
+        if not html_generator.is_executor_current(executor, env):
+            pool_stack.close()
+            executor = None
+        if executor is None:
+            executor = pool_stack.enter_context(
+                html_generator.page_executor(cfg["templates_dir"], cfg.get("template_cache_dir"), args.jobs)
+            )
+        return executor
+
+    def regenerate():
+        started = time.perf_counter()
+        prof = profiler.Profiler(enabled=True, trace_memory=False)
+        # ページごとのログは表示せず、警告と結果の要約だけを表示する
+        log = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(log):
+                pipeline.publish_site(
+                    cfg, *load_inputs(), jobs=args.jobs, force=args.force, prof=prof, env=env, executor=current_executor()
+                )
+        except (FileNotFoundError, FileExistsError, ValueError) as e:
+            print(f"エラー: データの読み込み中に問題が発生しました: {e}")
+            print("次の変更を待ちます。")
+            return
+        for line in log.getvalue().splitlines():
+            if line.startswith("警告"):
+                print(line)
+        report = prof.report()
+        print(f"{report['pages_written']} ページを更新しました"
+              f"（変更なし {report['pages_skipped']} ページ、{time.perf_counter() - started:.3f}s）。")
+
+    print(f"{cfg['data_dir']} の監視を開始しました（Ctrl+C で終了）。")
+    try:
+        with pool_stack:
+            watcher.watch(
+                [class_list_csv_path, class_names_csv_path, records_csv_path, teacher_names_csv_path],
+                regenerate, poll_interval=args.poll_interval, debounce=args.debounce
+            )
+    except KeyboardInterrupt:
+        print("監視を終了しました。")
 
 if __name__ == "__main__":
     if not os.environ.get('VIRTUAL_ENV'):
@@ -0,0 +1,51 @@
+import os
+import json
+import hashlib
+
+MANIFEST_FILENAME = ".latest_manifest.json"
+
+def get_manifest_path(config_data):
+    """docs/latest の隣に置くマニフェストファイルのパスを返す"""
+    return os.path.join(config_data["github_pages_output_base_dir"], MANIFEST_FILENAME)
+
+def load_manifest(manifest_path):
+    """
+    マニフェストを読み込む。
+    ファイルがない、または壊れている場合は空のマニフェストを返す（全ページを再生成する）。
+    """
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {"week_range_str": None, "pages": {}}
+    except (ValueError, OSError) as e:
+        print(f"警告: マニフェスト '{manifest_path}' を読み込めませんでした。全ページを再生成します: {e}")
+        return {"week_range_str": None, "pages": {}}
+
+    if not isinstance(manifest.get("pages"), dict):
+        manifest["pages"] = {}
+    return manifest
+
+def save_manifest(manifest_path, week_range_str, page_hashes, bundle_hash=None):
+    """
+    マニフェストを一時ファイル経由で書き出し、途中で中断しても壊れないようにする。
+    bundle_hash は週のバンドル（week.json）の内容のハッシュで、次回の生成で変更がなければ書き出しを省く。
+    """
+    manifest = {"week_range_str": week_range_str, "pages": page_hashes, "bundle": bundle_hash}
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, sort_keys=True, indent=1)
+    os.replace(tmp_path, manifest_path)
+
+def template_versions(env, template_names):
+    """テンプレートのソースのハッシュを返す（テンプレートを変更したら全ページを再生成するため）"""
+    versions = {}
+    for template_name in template_names:
+        source, _, _ = env.loader.get_source(env, template_name)
+        versions[template_name] = hashlib.sha256(source.encode('utf-8')).hexdigest()
+    return versions
+
+def compute_page_hash(page_inputs):
+    """ページの入力（JSONに変換できる値）からハッシュ文字列を計算する"""
+    serialized = json.dumps(page_inputs, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
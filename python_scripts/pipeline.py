@@ -0,0 +1,104 @@
+import os
+from python_scripts import data_parser
+from python_scripts import html_generator
+from python_scripts import bundle_generator
+from python_scripts import file_manager
+from python_scripts import manifest
+from python_scripts import profiler
+
+def load_class_data(cfg, school_year=None):
+    """
+    クラス一覧.csv と Class_names.csv を読み込み、(ClassListWeek, クラス名のリスト) を返す。
+    設定の stream_class_rows が True なら、クラス一覧.csv はデータ行を生成中に1行ずつ解析する StreamedClassList を返す。
+    """
+    load_class_list = data_parser.StreamedClassList if cfg.get("stream_class_rows") else data_parser.parse_class_list
+    class_list_week = load_class_list(
+        os.path.join(cfg["data_dir"], cfg["class_list_csv_filename"]),
+        cfg["csv_encoding"],
+        cfg["csv_data_start_col_offset"],
+        cfg["num_periods_per_day"],
+        school_year
+    )
+    master_class_info_list = data_parser.load_class_names_list(
+        os.path.join(cfg["data_dir"], cfg["class_names_csv_filename"]), cfg["csv_encoding"]
+    )
+    return class_list_week, master_class_info_list
+
+def load_teacher_data(cfg):
+    """
+    先生別ページ用の教師名リストと、時間割data.csv から作った教師の索引を読み込む。
+    時間割data.csv がない場合は先生別ページを生成しないため (None, None) を返す。
+    """
+    records_csv_path = os.path.join(cfg["data_dir"], cfg["timetable_records_csv_filename"])
+    if not os.path.exists(records_csv_path):
+        print(f"{records_csv_path} がないため、先生別の時間割は生成しません。")
+        return None, None
+
+    teacher_info_list = data_parser.load_teacher_info_list(
+        os.path.join(cfg["data_dir"], cfg["teacher_names_csv_filename"]), cfg["teacher_names_csv_encoding"]
+    )
+    teacher_index = data_parser.build_teacher_index(
+        records_csv_path, cfg["csv_encoding"], cfg["num_periods_per_day"], cfg["timetable_record_columns"]
+    )
+    return teacher_info_list, teacher_index
+
+def publish_site(cfg, class_list_week, master_class_info_list, teacher_info_list, teacher_index,
+                 jobs=1, force=False, prof=profiler.NULL_PROFILER, profile_dump_path=None, env=None, executor=None):
+    """
+    ページをステージングに生成して latest と差し替え、マニフェストを更新する。
+    前回と同じ週なら変更のあったページだけを書き出し、違う週なら latest をアーカイブする。
+    env（Jinja2環境）と executor（html_generator.page_executor のプロセスプール）を指定すると、
+    watch モードのようにテンプレートとワーカープロセスを使い回す。
+    """
+    manifest_path = manifest.get_manifest_path(cfg)
+    previous_manifest = manifest.load_manifest(manifest_path)
+    file_manager.recover_interrupted_publish(cfg)
+    # 公開中の latest/index.html の週を正とする。マニフェストと食い違う場合（公開後、マニフェストの保存前に
+    # 中断した場合など）はマニフェストを使わない。マニフェストも index.html もない場合は前回の週なし
+    published_week_range_str = file_manager.published_week_range(cfg)
+    if published_week_range_str and previous_manifest.get("week_range_str") not in (None, published_week_range_str):
+        print(f"警告: マニフェストの週が公開中の latest ({published_week_range_str}) と異なるため、全ページを再生成します。")
+        previous_manifest = {"week_range_str": None, "pages": {}}
+    previous_week_range_str = published_week_range_str or previous_manifest.get("week_range_str")
+
+    same_week = previous_week_range_str == class_list_week.week_range_str
+    if same_week:
+        # 同じ週の再生成では latest の内容を引き継ぎ、変更のあったページだけを書き出す
+        print(f"{previous_week_range_str} の時間割を更新します（アーカイブは行いません）。")
+        previous_page_hashes = {} if force else previous_manifest["pages"]
+        previous_bundle_hash = None if force else previous_manifest.get("bundle")
+        archive_week_range_str = None
+    else:
+        # latest に残っている前回の週を、その週の名前でアーカイブする
+        previous_page_hashes = {}
+        previous_bundle_hash = None
+        archive_week_range_str = previous_week_range_str
+        latest_output_dir = os.path.join(cfg["github_pages_output_base_dir"], "latest")
+        if archive_week_range_str:
+            # 別の内容の既存ディレクトリは上書きしない。ページを生成する前に確認する（同じ週のアーカイブは作成済みとして扱う）
+            file_manager.check_archive_target(cfg, archive_week_range_str)
+        elif os.path.isdir(latest_output_dir) and os.listdir(latest_output_dir):
+            raise ValueError(
+                f"エラー: 公開中の '{latest_output_dir}' がどの週か分からないため、アーカイブできません。"
+                "latest を週の名前のディレクトリに移動してから再実行してください。"
+            )
+
+    # ステージングに全ページを揃えてから latest と差し替え、公開中のサイトが欠けた状態にならないようにする
+    with prof.phase("prepare_staging"):
+        staging_dir = file_manager.prepare_staging_dir(cfg, seed_from_latest=same_week)
+    with prof.phase("render_pages"):
+        page_hashes = html_generator.generate_all_htmls(
+            cfg, class_list_week, master_class_info_list,
+            jobs=jobs, previous_page_hashes=previous_page_hashes, output_dir=staging_dir,
+            teacher_info_list=teacher_info_list, teacher_index=teacher_index,
+            profiler=prof, profile_dump_path=profile_dump_path, env=env, executor=executor
+        )
+    with prof.phase("week_bundle"):
+        bundle_hash = bundle_generator.generate_week_bundle(
+            cfg, class_list_week, master_class_info_list, staging_dir,
+            teacher_info_list=teacher_info_list, teacher_index=teacher_index, previous_hash=previous_bundle_hash
+        )
+    with prof.phase("publish"):
+        file_manager.publish_staged_site(cfg, staging_dir, archive_week_range_str)
+        manifest.save_manifest(manifest_path, class_list_week.week_range_str, page_hashes, bundle_hash)
+    return page_hashes
@@ -0,0 +1,161 @@
+import sys
+import json
+import time
+import contextlib
+
+# ページ単位の計測で tracemalloc のピークをリセットする前の値（フェーズのピークに含めるため）
+_carried_peak = 0
+
+def _reset_peak():
+    global _carried_peak
+    import tracemalloc
+    _carried_peak = max(_carried_peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+
+@contextlib.contextmanager
+def track_page_peak(page_stats):
+    """
+    with ブロックの間に増えたメモリのピーク（開始時の使用量との差）を page_stats["peak_memory_bytes"] に記録する。
+    tracemalloc が動いていないプロセスでは None を記録する。囲んでいるフェーズのピークは失われない。
+    """
+    import tracemalloc
+    if not tracemalloc.is_tracing():
+        page_stats["peak_memory_bytes"] = None
+        yield
+        return
+    _reset_peak()
+    started_memory = tracemalloc.get_traced_memory()[0]
+    try:
+        yield
+    finally:
+        page_stats["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1] - started_memory
+
+class Profiler:
+    """
+    main の各フェーズと各ページの実行時間・CPU時間・ピークメモリ・書き込みバイト数を記録する。
+    enabled が False の場合は何も計測しない（通常の実行ではオーバーヘッドなし）。
+    ピークメモリは tracemalloc で計測するため、Python が確保したメモリが対象。
+    フェーズのピークメモリはこのプロセスだけの値で、--jobs 2 以上のワーカーのメモリは含まない。
+    ワーカーでレンダリングしたページのピークメモリは、ワーカー側で計測してページごとに記録する。
+    計測を終えたら close() を呼ぶか with 文で使い、この Profiler が開始した tracemalloc を止める。
+    """
+
+    def __init__(self, enabled=False, trace_memory=True):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.phases = []
+        self.pages = []
+        self.bytes_written = 0
+        self.pages_skipped = 0
+        self._started = time.perf_counter()
+        # 既に tracemalloc が動いている場合（呼び出し元が開始した場合）は、close() で止めない
+        self._started_tracing = False
+        if self.trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+
+    def close(self):
+        """この Profiler が開始した tracemalloc を止める。記録済みの計測結果はそのまま参照できる"""
+        if self._started_tracing:
+            import tracemalloc
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """with ブロックの実行を1つのフェーズとして記録する"""
+        if not self.enabled:
+            yield
+            return
+
+        global _carried_peak
+        if self.trace_memory:
+            _reset_peak()
+            _carried_peak = 0
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield
+        finally:
+            peak_memory = None
+            if self.trace_memory:
+                import tracemalloc
+                peak_memory = max(_carried_peak, tracemalloc.get_traced_memory()[1])
+            self.phases.append({
+                "name": name,
+                "wall_seconds": time.perf_counter() - wall_started,
+                "cpu_seconds": time.process_time() - cpu_started,
+                "peak_memory_bytes": peak_memory,
+            })
+
+    def add_phase(self, name, wall_seconds):
+        """計測済みの時間（インポート時間など）をフェーズとして追加する"""
+        if self.enabled:
+            self.phases.append({"name": name, "wall_seconds": wall_seconds, "cpu_seconds": None, "peak_memory_bytes": None})
+
+    def record_page(self, page_stats):
+        """
+        html_generator が返す1ページ分の計測結果を記録する。
+        path は latest からの相対パス、peak_memory_bytes はそのページのレンダリング中に増えたメモリのピーク。
+        """
+        if not self.enabled:
+            return
+        self.pages.append(page_stats)
+        self.bytes_written += page_stats["bytes"]
+
+    def record_skipped_page(self):
+        if self.enabled:
+            self.pages_skipped += 1
+
+    def report(self):
+        """機械可読な計測結果の辞書を返す"""
+        max_rss_bytes = None
+        try:
+            import resource
+            # Linux では KiB、macOS ではバイト単位
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            max_rss_bytes = max_rss if sys.platform == "darwin" else max_rss * 1024
+        except ImportError:
+            pass
+        page_peaks = [page["peak_memory_bytes"] for page in self.pages if page.get("peak_memory_bytes") is not None]
+        return {
+            "total_wall_seconds": time.perf_counter() - self._started,
+            "phases": self.phases,
+            "pages": self.pages,
+            "pages_written": len(self.pages),
+            "pages_skipped": self.pages_skipped,
+            "bytes_written": self.bytes_written,
+            "max_page_peak_memory_bytes": max(page_peaks) if page_peaks else None,
+            "max_rss_bytes": max_rss_bytes,
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=1)
+        print(f"計測結果を {path} に書き出しました。")
+
+    def print_summary(self):
+        report = self.report()
+        print("--- フェーズ別の計測結果 ---")
+        for phase in report["phases"]:
+            cpu = f"{phase['cpu_seconds']:.4f}s" if phase["cpu_seconds"] is not None else "-"
+            peak = f"{phase['peak_memory_bytes'] / 1024 / 1024:.1f}MiB" if phase["peak_memory_bytes"] is not None else "-"
+            print(f"{phase['name']:<16} 実時間 {phase['wall_seconds']:.4f}s  CPU {cpu}  ピークメモリ {peak}")
+        if report["pages"]:
+            slowest = max(report["pages"], key=lambda page: page["wall_seconds"])
+            print(f"書き出したページ {report['pages_written']} 件（スキップ {report['pages_skipped']} 件）、"
+                  f"{report['bytes_written']} バイト、最も遅いページ {slowest['path']} ({slowest['wall_seconds']:.4f}s)")
+            if report["max_page_peak_memory_bytes"] is not None:
+                print(f"1ページのレンダリングで増えたメモリの最大 {report['max_page_peak_memory_bytes'] / 1024:.1f}KiB")
+        print(f"合計 {report['total_wall_seconds']:.4f}s")
+
+# 計測しない場合に使う共有インスタンス
+NULL_PROFILER = Profiler(enabled=False)
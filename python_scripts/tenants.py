@@ -0,0 +1,109 @@
+import io
+import os
+import json
+import time
+import contextlib
+from python_scripts import html_generator
+from python_scripts import pipeline
+from python_scripts import profiler
+
+TENANT_LOG_FILENAME = ".generate.log"
+
+# テンプレートのディレクトリとキャッシュごとに、プロセスごとに1つだけ作るJinja2環境。
+# ワーカープロセスは（Windows の spawn では親のメモリを引き継がないため）最初に担当した学校で作り、以後の学校で使い回す
+_env_cache = {}
+
+def _shared_env(cfg):
+    key = (cfg["templates_dir"], cfg.get("template_cache_dir"))
+    env = _env_cache.get(key)
+    if env is None:
+        env = html_generator.create_jinja2_env(*key)
+        html_generator.load_page_templates(env)
+        _env_cache[key] = env
+    return env
+
+def run_tenant(name, cfg, force=False):
+    """
+    1校分の生成（generate と同じ処理）を実行し、結果の辞書を返す。
+    どんな例外でも結果に記録して返すため、1校の失敗がほかの学校の生成を止めることはない。
+    ログは出力先の .generate.log に書き出す。
+    """
+    started = time.perf_counter()
+    prof = profiler.Profiler(enabled=True, trace_memory=False)
+    log = io.StringIO()
+    result = {"name": name, "status": "ok", "week": None, "error": None}
+    try:
+        with contextlib.redirect_stdout(log):
+            class_list_week, master_class_info_list = pipeline.load_class_data(cfg)
+            teacher_info_list, teacher_index = pipeline.load_teacher_data(cfg)
+            pipeline.publish_site(
+                cfg, class_list_week, master_class_info_list, teacher_info_list, teacher_index,
+                force=force, prof=prof, env=_shared_env(cfg)
+            )
+        result["week"] = class_list_week.week_range_str
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    report = prof.report()
+    result["seconds"] = time.perf_counter() - started
+    result["pages_written"] = report["pages_written"]
+    result["pages_skipped"] = report["pages_skipped"]
+    try:
+        os.makedirs(cfg["github_pages_output_base_dir"], exist_ok=True)
+        with open(os.path.join(cfg["github_pages_output_base_dir"], TENANT_LOG_FILENAME), 'w', encoding='utf-8') as f:
+            f.write(log.getvalue())
+            if result["error"]:
+                f.write(f"エラー: {result['error']}\n")
+    except OSError:
+        pass
+    return result
+
+def _run_tenant_in_worker(tenant):
+    name, cfg, force = tenant
+    return run_tenant(name, cfg, force)
+
+def run_tenants(tenant_configs, jobs=1, force=False):
+    """
+    複数校の生成を最大 jobs 個のワーカープロセスで並行して実行し、学校の順序で結果のリストを返す。
+    テンプレートは親プロセスで1回だけコンパイルして template_cache_dir のバイトコードキャッシュに保存し、
+    ワーカーはそのキャッシュから読み込む（テンプレートの解析とコンパイルを学校ごとに繰り返さない）。
+    """
+    for _, cfg in tenant_configs:
+        _shared_env(cfg)
+
+    tenants = [(name, cfg, force) for name, cfg in tenant_configs]
+    if jobs <= 1 or len(tenants) <= 1:
+        return [_run_tenant_in_worker(tenant) for tenant in tenants]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_run_tenant_in_worker, tenant) for tenant in tenants]
+        results = []
+        for (name, _, _), future in zip(tenants, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # ワーカープロセス自体が異常終了した場合も、その学校の失敗として扱う
+                results.append({"name": name, "status": "failed", "week": None, "error": f"{type(e).__name__}: {e}",
+                                "seconds": None, "pages_written": 0, "pages_skipped": 0})
+    return results
+
+def print_summary(results):
+    """学校ごとの結果を表示し、失敗した学校の数を返す"""
+    print("--- 学校別の生成結果 ---")
+    for result in results:
+        seconds = f"{result['seconds']:.3f}s" if result["seconds"] is not None else "-"
+        if result["status"] == "ok":
+            print(f"{result['name']}: 成功 {result['week']}  書き出し {result['pages_written']} ページ"
+                  f"（変更なし {result['pages_skipped']} ページ）  {seconds}")
+        else:
+            print(f"{result['name']}: 失敗  {seconds}  {result['error']}")
+    failures = sum(1 for result in results if result["status"] != "ok")
+    print(f"{len(results)} 校のうち {len(results) - failures} 校が成功、{failures} 校が失敗しました。")
+    return failures
+
+def write_report(path, results):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"tenants": results}, f, ensure_ascii=False, indent=1)
+    print(f"生成結果を {path} に書き出しました。")
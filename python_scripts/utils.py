@@ -1,4 +1,6 @@
 import datetime
+import re
+import unicodedata
 
 def get_week_range_string(date=None):
     if date is None:
@@ -7,10 +9,35 @@ def get_week_range_string(date=None):
     end_of_week = start_of_week + datetime.timedelta(days=6)
     return f"{start_of_week.strftime('%Y-%m-%d')}_{end_of_week.strftime('%m-%d')}"
 
+# 年度の始まりの月（4月）
+SCHOOL_YEAR_START_MONTH = 4
+
+def get_school_year(date=None):
+    """date を含む年度（4月始まり）を返す。例: 2026-02-10 → 2025"""
+    if date is None:
+        date = datetime.date.today()
+    return date.year if date.month >= SCHOOL_YEAR_START_MONTH else date.year - 1
+
+def year_for_month_in_school_year(month, school_year):
+    """年度 school_year の month 月が属する西暦年を返す（1～3月は翌年）"""
+    return school_year if month >= SCHOOL_YEAR_START_MONTH else school_year + 1
+
 def decode_sjis(s):
     """
     この関数はShift_JISデコードを行いません。
     ファイルの読み込み時にエンコーディングを指定する方法に変更したため、
     この関数は単純に受け取った値を文字列として返すだけにします。
     """
-    return str(s)
\ No newline at end of file
+    return str(s)
+def normalize_class_name(name):
+    """
+    クラス名の表記ゆれを吸収した比較用のキーを返す。
+    全角・半角の違い、ハイフンの種類、空白を統一し、「3年1組」は「3-1」、「3年理探」は「3理探」にそろえる。
+    例: "３－１" → "3-1", "3年1組" → "3-1", " ３理探" → "3理探"
+    """
+    key = unicodedata.normalize('NFKC', str(name))
+    key = re.sub(r'\s+', '', key)
+    key = re.sub(r'[‐‑‒–—―−ｰー]', '-', key)
+    key = re.sub(r'^(\d+)年(\d+)組$', r'\1-\2', key)
+    key = re.sub(r'^(\d+)年', r'\1', key)
+    return key
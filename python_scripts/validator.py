@@ -0,0 +1,205 @@
+import os
+import re
+import csv
+import unicodedata
+from python_scripts import utils
+from python_scripts import data_parser
+
+def build_slot_indexes(records_csv_path, encoding, record_columns, exempt_subjects=()):
+    """
+    時間割data.csv を1回だけ走査し、次の2つのハッシュ索引を作る。
+    - (曜日, 時限, 教師) → 教室 → クラス名のリスト（exempt_subjects の科目のレコードは含めない）
+    - (曜日, 時限, 教室) → 科目 → クラス名のリスト
+    あわせて、レコードに現れたクラス名（正規化キー → 元の表記）も返す。
+    """
+    exempt_subjects = {unicodedata.normalize('NFKC', subject).strip() for subject in exempt_subjects}
+    day_col = record_columns["day"]
+    period_col = record_columns["period"]
+    class_col = record_columns["class_name"]
+    room_col = record_columns["room"]
+    subject_col = record_columns["subject"]
+    teacher_col = record_columns["teacher"]
+    max_col = max(day_col, period_col, class_col, room_col, subject_col, teacher_col)
+
+    teacher_slot_index = {}
+    room_slot_index = {}
+    record_class_names = {}
+    try:
+        with open(records_csv_path, 'r', encoding=encoding, newline='') as f:
+            for row in csv.reader(f):
+                if len(row) <= max_col:
+                    continue
+                day_char = row[day_col].strip()
+                period_str = unicodedata.normalize('NFKC', row[period_col]).strip()
+                class_name = row[class_col].strip()
+                room = row[room_col].strip()
+                subject = row[subject_col].strip()
+                teacher = row[teacher_col].strip()
+                if not day_char or not period_str:
+                    continue
+
+                if class_name:
+                    record_class_names.setdefault(utils.normalize_class_name(class_name), class_name)
+                # 学年行事・合同授業は1人で複数の教室を担当するため、教師の重複割り当ての対象にしない
+                if teacher and unicodedata.normalize('NFKC', subject) not in exempt_subjects:
+                    rooms = teacher_slot_index.setdefault((day_char, period_str, teacher), {})
+                    rooms.setdefault(room, []).append(class_name)
+                if room:
+                    subjects = room_slot_index.setdefault((day_char, period_str, room), {})
+                    subjects.setdefault(subject, []).append(class_name)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"エラー: 時間割ファイル '{records_csv_path}' が見つかりません。")
+    except Exception as e:
+        raise ValueError(f"エラー: 時間割ファイル '{records_csv_path}' の読み込み中に問題が発生しました: {e}")
+
+    return teacher_slot_index, room_slot_index, record_class_names
+
+def find_teacher_double_bookings(teacher_slot_index):
+    """同じコマに同じ教師が複数の教室に割り当てられているものを返す"""
+    problems = []
+    for (day_char, period_str, teacher), rooms in teacher_slot_index.items():
+        if len(rooms) > 1:
+            room_list = "、".join(f"{room}({'・'.join(sorted(set(classes)))})" for room, classes in rooms.items())
+            problems.append(f"{day_char}{period_str}限: {teacher} 先生が複数の教室に割り当てられています: {room_list}")
+    return problems
+
+def find_room_clashes(room_slot_index):
+    """
+    同じコマに同じ教室で異なる科目が行われているものを返す。
+    1つのクラスだけの分割授業（古典探究を古典と漢文で分けるなど）は重複とみなさない。
+    """
+    problems = []
+    for (day_char, period_str, room), subjects in room_slot_index.items():
+        if len(subjects) > 1 and len({class_name for classes in subjects.values() for class_name in classes}) > 1:
+            subject_list = "、".join(f"{subject}({'・'.join(sorted(set(classes)))})" for subject, classes in subjects.items())
+            problems.append(f"{day_char}{period_str}限: 教室 {room} で複数の科目が重なっています: {subject_list}")
+    return problems
+
+def find_unmatched_classes(master_class_info_list, class_rows, record_class_names):
+    """
+    Class_names.csv・クラス一覧.csv・時間割data.csv のクラスを、行の位置ではなく
+    正規化したクラス名で突き合わせ、どれかに対応がないクラスを返す。
+    """
+    master_keys = {}
+    for class_info in master_class_info_list:
+        expected_name = class_info.get('internal_name', class_info['name'])
+        master_keys.setdefault(utils.normalize_class_name(expected_name), class_info['name'])
+    class_list_keys = {}
+    for class_row in class_rows:
+        class_list_keys.setdefault(utils.normalize_class_name(class_row.name), class_row.name)
+
+    problems = []
+    for key, display_name in master_keys.items():
+        if key not in class_list_keys:
+            problems.append(f"Class_names.csv の '{display_name}' に対応するクラスが クラス一覧.csv にありません。")
+    for key, class_name in class_list_keys.items():
+        if key not in master_keys:
+            problems.append(f"クラス一覧.csv の '{class_name}' に対応するクラスが Class_names.csv にありません。")
+    for key, class_name in record_class_names.items():
+        if key not in class_list_keys:
+            problems.append(f"時間割data.csv の '{class_name}' に対応するクラスが クラス一覧.csv にありません。")
+    return problems
+
+def class_keys_for_code(class_code, code_suffixes):
+    """
+    先生時間割.csv のクラス略号（"32"、"3ｺ"、"31、32" など）を、クラス名の正規化キーのリストに変換する。
+    学年の数字で始まらない略号（"理"、"※" など、クラスの授業ではないもの）は空のリストになる。
+    """
+    suffixes = {unicodedata.normalize('NFKC', suffix): name for suffix, name in code_suffixes.items()}
+    class_keys = []
+    for code in re.split(r'[、,]', unicodedata.normalize('NFKC', class_code)):
+        code = code.strip()
+        match = re.match(r'^(\d)(\d+)$', code)
+        if match:
+            class_keys.append(f"{match.group(1)}-{match.group(2)}")
+            continue
+        match = re.match(r'^(\d)(.+)$', code)
+        if match and match.group(2) in suffixes:
+            class_keys.append(utils.normalize_class_name(match.group(1) + suffixes[match.group(2)]))
+    return class_keys
+
+def _subject_key(subject):
+    """"古典 (古典 )" のような括弧書きを除いた科目名の比較用キー"""
+    return unicodedata.normalize('NFKC', subject).split("(")[0].strip()
+
+def find_teacher_grid_mismatches(teacher_grids, class_list_week, code_suffixes):
+    """
+    先生時間割.csv の各先生の授業を クラス一覧.csv の同じコマと突き合わせ、科目が食い違うものを返す。
+    2つのファイルの週（見出しの日付）が違う場合は、その1件だけを返す。
+    """
+    class_lessons = {}
+    for class_row in class_list_week.class_rows:
+        class_lessons.setdefault(utils.normalize_class_name(class_row.name), (class_row.name, class_row.lessons))
+    class_dates = [unicodedata.normalize('NFKC', date).strip() for date in class_list_week.header_dates_decoded[:5]]
+
+    problems = []
+    unknown_codes = set()
+    for grid in teacher_grids:
+        teacher_dates = [unicodedata.normalize('NFKC', date).strip() for date in grid.header_dates]
+        if teacher_dates != class_dates:
+            return [f"先生時間割.csv の週（{teacher_dates[0]}～）が クラス一覧.csv の週（{class_dates[0]}～）と違います。"]
+        for day_index, day_lessons in enumerate(grid.lessons):
+            for period_index, lesson in enumerate(day_lessons):
+                if lesson is None:
+                    continue
+                subject, class_code = lesson
+                slot = f"{data_parser.DAYS_OF_WEEK[day_index]}{period_index + 1}限"
+                for class_key in class_keys_for_code(class_code, code_suffixes):
+                    if class_key not in class_lessons:
+                        if class_key not in unknown_codes:
+                            unknown_codes.add(class_key)
+                            problems.append(f"先生時間割.csv のクラス略号 '{class_code}' に対応するクラスが クラス一覧.csv にありません。")
+                        continue
+                    class_name, lessons = class_lessons[class_key]
+                    class_lesson = lessons[day_index][period_index] if period_index < len(lessons[day_index]) else ""
+                    if _subject_key(class_lesson) != _subject_key(subject):
+                        problems.append(
+                            f"{slot}: {grid.name} 先生の {subject} ({class_code}) が、クラス一覧.csv の {class_name} では "
+                            f"'{class_lesson or '空き'}' になっています。"
+                        )
+    return problems
+
+def validate(config_data, class_list_week, master_class_info_list):
+    """
+    アップロードされたデータの整合性を検査し、問題の種類ごとのリストを持つ辞書を返す。
+    どの検査もレコード数に比例する時間で終わる。
+    """
+    records_csv_path = os.path.join(config_data["data_dir"], config_data["timetable_records_csv_filename"])
+    teacher_slot_index, room_slot_index, record_class_names = build_slot_indexes(
+        records_csv_path, config_data["csv_encoding"], config_data["timetable_record_columns"],
+        config_data["double_booking_exempt_subjects"]
+    )
+    report = {
+        "teacher_double_bookings": find_teacher_double_bookings(teacher_slot_index),
+        "room_clashes": find_room_clashes(room_slot_index),
+        "unmatched_classes": find_unmatched_classes(master_class_info_list, class_list_week.class_rows, record_class_names),
+    }
+    teacher_timetable_csv_path = os.path.join(config_data["data_dir"], config_data["teacher_timetable_csv_filename"])
+    if os.path.exists(teacher_timetable_csv_path):
+        teacher_grids = data_parser.parse_teacher_timetable(
+            teacher_timetable_csv_path, config_data["csv_encoding"], config_data["num_periods_per_day"]
+        )
+        report["teacher_grid_mismatches"] = find_teacher_grid_mismatches(
+            teacher_grids, class_list_week, config_data["teacher_class_code_suffixes"]
+        )
+    return report
+
+def print_report(report):
+    """validate の結果を表示し、問題の総数を返す"""
+    titles = {
+        "teacher_double_bookings": "教師の重複割り当て",
+        "room_clashes": "教室の重複",
+        "unmatched_classes": "対応のないクラス",
+        "teacher_grid_mismatches": "先生時間割との不一致",
+    }
+    total = 0
+    for key, title in titles.items():
+        if key not in report:
+            continue
+        problems = report[key]
+        total += len(problems)
+        print(f"--- {title}: {len(problems)} 件 ---")
+        for problem in problems:
+            print(f"警告: {problem}")
+    print(f"データの検査が完了しました（問題 {total} 件）。")
+    return total
@@ -0,0 +1,71 @@
+import os
+import time
+
+def file_signature(path):
+    """ファイルの変更を判定するための (更新時刻, サイズ)。ファイルがなければ None"""
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+def snapshot(paths):
+    return {path: file_signature(path) for path in paths}
+
+class FileCache:
+    """
+    ファイルの読み込み結果を、更新時刻とサイズが変わらない限り使い回す。
+    watch モードで、変更のなかった Class_names.csv や時間割data.csv を読み直さないために使う。
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def load(self, path, loader):
+        signature = file_signature(path)
+        entry = self._entries.get(path)
+        if entry is not None and signature is not None and entry[0] == signature:
+            return entry[1]
+        value = loader(path)
+        self._entries[path] = (signature, value)
+        return value
+
+def wait_for_change(paths, previous_snapshot, poll_interval=0.1, debounce=0.2, should_stop=None):
+    """
+    paths のいずれかが変更されるまでポーリングで待ち、変更後の状態を返す。
+    保存が続けて行われる間は待ち続け、debounce 秒のあいだ変化がなくなってから返す。
+    should_stop が True を返した場合は None を返す。
+    """
+    current_snapshot = previous_snapshot
+    while current_snapshot == previous_snapshot:
+        if should_stop is not None and should_stop():
+            return None
+        time.sleep(poll_interval)
+        current_snapshot = snapshot(paths)
+
+    stable_since = time.monotonic()
+    while time.monotonic() - stable_since < debounce:
+        time.sleep(poll_interval)
+        latest_snapshot = snapshot(paths)
+        if latest_snapshot != current_snapshot:
+            current_snapshot = latest_snapshot
+            stable_since = time.monotonic()
+    return current_snapshot
+
+def watch(paths, on_change, poll_interval=0.1, debounce=0.2, should_stop=None, max_cycles=None):
+    """
+    起動時に1回 on_change を呼び、その後は paths が変更されるたびに on_change を呼ぶ。
+    max_cycles を指定すると、その回数だけ変更を処理して終了する（テスト用）。
+    """
+    current_snapshot = snapshot(paths)
+    on_change()
+    cycles = 0
+    while max_cycles is None or cycles < max_cycles:
+        new_snapshot = wait_for_change(paths, current_snapshot, poll_interval, debounce, should_stop)
+        if new_snapshot is None:
+            return
+        changed = [os.path.basename(path) for path in paths if new_snapshot[path] != current_snapshot[path]]
+        print(f"{', '.join(changed)} の変更を検出しました。")
+        current_snapshot = new_snapshot
+        on_change()
+        cycles += 1
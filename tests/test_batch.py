@@ -0,0 +1,51 @@
+import os
+import sys
+import datetime
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_scripts import batch
+from python_scripts import config
+from benchmarks import synthetic_data
+
+def _make_config(data_dir, output_dir):
+    cfg = config.load_config()
+    cfg["data_dir"] = str(data_dir)
+    cfg["github_pages_output_base_dir"] = str(output_dir)
+    return cfg
+
+def test_run_backfill_writes_each_week_into_its_archive_dir(tmp_path):
+    school = synthetic_data.make_school(4)
+    weeks_dir = tmp_path / "weeks"
+    for week_index, week_start in enumerate([datetime.date(2025, 12, 22), datetime.date(2026, 1, 5)]):
+        synthetic_data.write_week(
+            str(weeks_dir / f"week_{week_index + 1:02d}"), school, week_start, synthetic_data.make_week_lessons(school, week_index)
+        )
+    docs_dir = tmp_path / "docs"
+    cfg = _make_config(weeks_dir / "week_01", docs_dir)
+    # 同じ週の入力は1つだけを生成する
+    inputs = [str(weeks_dir), str(weeks_dir / "week_01" / "クラス一覧.csv")]
+
+    failures = batch.run_backfill(cfg, inputs, school_year=2025)
+
+    assert failures == 0
+    # 1月の週は年度の翌年になる
+    assert sorted(os.listdir(docs_dir)) == ["2025-12-22_12-28", "2026-01-05_01-11", "print.css", "style.css", "viewer.html"]
+    week_dir = docs_dir / "2026-01-05_01-11"
+    assert sorted(os.listdir(week_dir)) == ["class", "index.html", "teacher", "week.json"]
+    assert len(os.listdir(week_dir / "class")) == 4
+    with open(week_dir / "index.html", encoding='utf-8') as f:
+        assert "2026-01-05_01-11 の時間割" in f.read()
+
+def test_run_backfill_reports_unreadable_weeks(tmp_path, capsys):
+    synthetic_data.generate_weeks(str(tmp_path / "weeks"), 2, 1)
+    broken_csv = tmp_path / "broken.csv"
+    broken_csv.write_text("ヘッダーだけ\n", encoding='cp932')
+    cfg = _make_config(tmp_path / "weeks" / "week_01", tmp_path / "docs")
+
+    failures = batch.run_backfill(cfg, [str(tmp_path / "weeks"), str(broken_csv)], school_year=2025)
+
+    assert failures == 1
+    assert sorted(os.listdir(tmp_path / "docs")) == ["2025-04-07_04-13", "print.css", "style.css", "viewer.html"]
+    assert "broken.csv' のバックフィルに失敗しました" in capsys.readouterr().out
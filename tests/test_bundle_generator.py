@@ -0,0 +1,86 @@
+import os
+import sys
+import json
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_scripts import bundle_generator
+from python_scripts import config
+from python_scripts import data_parser
+
+def _make_week():
+    lessons_31 = (("", "論国", "数A", "", "", ""),) + (("体",) * 6,) * 4
+    lessons_32 = (("論国", "", "", "", "", ""),) + (("",) * 6,) * 4
+    return data_parser.ClassListWeek(
+        "2025-05-12_05-18",
+        ["1", "2", "3", "4", "5", "6"],
+        {},
+        ["5/12 (月)", "5/13 (火)", "5/14 (水)", "5/15 (木)", "5/16 (金)"],
+        [data_parser.ClassRow("３－１", lessons_31), data_parser.ClassRow("３－２", lessons_32)],
+    )
+
+def _read_bundle(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def test_week_bundle_writer_holds_compacted_grids_and_prebuilt_indexes(tmp_path):
+    class_info = [{'name': "3年1組", 'filename_base': "C31"}, {'name': "3年2組", 'filename_base': "C32"}]
+    teacher_info = [{'name': "奥山", 'filename_base': "t01"}, {'name': "渡部", 'filename_base': "t02"}]
+    day_slots = [[[] for _ in range(6)] for _ in range(5)]
+    day_slots[0][1] = ["論国 ３－１"]
+    week = _make_week()
+    bundle_path = str(tmp_path / "week.json")
+
+    with bundle_generator.WeekBundleWriter(bundle_path, week) as writer:
+        for class_info_entry, class_row in zip(class_info, week.class_rows):
+            writer.add_class(class_info_entry, class_row)
+        _, bytes_written = writer.finish(teacher_info, {"奥山": day_slots})
+
+    bundle = _read_bundle(bundle_path)
+    assert os.path.getsize(bundle_path) == bytes_written
+    strings = bundle["strings"]
+    class_31 = bundle["classes"][0]
+    assert (class_31["name"], class_31["file"], class_31["table"]) == ("3年1組", "C31", "３－１")
+    # 表は前詰め済み（月曜の1限に2限の論国が表示される）
+    assert [strings[lesson_id] for lesson_id in class_31["grid"][0]] == ["論国", "体", "体", "体", "体"]
+    assert [strings[lesson_id] for lesson_id in class_31["grid"][2]] == ["-", "体", "体", "体", "体"]
+    # 科目の索引は前詰め前の実際のコマを、クラスごとに曜日ごとの時限のビットで持つ
+    subjects = {strings[int(string_id)]: entries for string_id, entries in bundle["index"]["subjects"].items()}
+    assert subjects == {
+        "論国": [[0, 0b10, 0, 0, 0, 0], [1, 0b1, 0, 0, 0, 0]],
+        "数A": [[0, 0b100, 0, 0, 0, 0]],
+        "体": [[0, 0, 0b111111, 0b111111, 0b111111, 0b111111]],
+    }
+    assert [teacher["name"] for teacher in bundle["teachers"]] == ["奥山"]
+    assert bundle["index"]["teachers"] == [[0b10, 0, 0, 0, 0]]
+    assert sorted(os.listdir(tmp_path)) == ["week.json"]
+
+def test_generate_week_bundle_skips_unchanged_bundle(tmp_path, capsys):
+    cfg = config.load_config()
+    cfg["github_pages_output_base_dir"] = str(tmp_path)
+    class_info = [{'name': "3年1組", 'filename_base': "C31"}, {'name': "3年2組", 'filename_base': "C32"}]
+    output_dir = str(tmp_path / "latest")
+
+    bundle_hash = bundle_generator.generate_week_bundle(cfg, _make_week(), class_info, output_dir)
+    bundle_path = os.path.join(output_dir, "week.json")
+    inode = os.stat(bundle_path).st_ino
+    assert bundle_generator.generate_week_bundle(cfg, _make_week(), class_info, output_dir, previous_hash=bundle_hash) == bundle_hash
+
+    # 内容が同じなら week.json を書き換えない
+    assert os.stat(bundle_path).st_ino == inode
+    assert "変更がないためスキップしました" in capsys.readouterr().out
+    assert sorted(os.listdir(output_dir)) == ["week.json"]
+
+def test_generate_week_bundle_writes_minified_json_and_viewer(tmp_path):
+    cfg = config.load_config()
+    cfg["github_pages_output_base_dir"] = str(tmp_path)
+    class_info = [{'name': "3年1組", 'filename_base': "C31"}, {'name': "3年2組", 'filename_base': "C32"}]
+
+    bundle_generator.generate_week_bundle(cfg, _make_week(), class_info, str(tmp_path / "latest"))
+
+    with open(tmp_path / "latest" / "week.json", encoding='utf-8') as f:
+        text = f.read()
+    assert "\n" not in text and ", " not in text
+    assert json.loads(text)["week"] == "2025-05-12_05-18"
+    assert os.path.isfile(tmp_path / "viewer.html")
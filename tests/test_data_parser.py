@@ -0,0 +1,165 @@
+import os
+import sys
+
+import pytest
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_scripts import data_parser
+
+def _write_class_list_csv(path, class_rows):
+    """クラス一覧.csv と同じレイアウト（cp932）のテスト用ファイルを書き出す"""
+    date_row = [" "]
+    for date_str in [" 5/12 (月)", " 5/13 (火)", " 5/14 (水)", " 5/15 (木)", " 5/16 (金)"]:
+        date_row += [date_str, "", "", "", "", ""]
+    period_row = [" "] + ["１", "２", "３", "４", "５", "６"] * 5
+    lines = ['"＜クラスの授業時間割一覧＞"']
+    for row in [date_row, period_row] + class_rows:
+        lines.append(",".join(f'"{cell}"' for cell in row + [""]))
+    with open(path, 'w', encoding='cp932', newline='') as f:
+        f.write("\r\n".join(lines) + "\r\n")
+
+def test_parse_class_list_builds_week_model(tmp_path):
+    csv_path = tmp_path / "クラス一覧.csv"
+    lessons = [f" L{i}" for i in range(30)]
+    lessons[5] = " "
+    _write_class_list_csv(csv_path, [[" ３－１"] + lessons, [" ３－２"] + [" "] * 30])
+
+    week = data_parser.parse_class_list(str(csv_path), "cp932", 1, 6)
+
+    assert week.header_dates_decoded == ["5/12 (月)", "5/13 (火)", "5/14 (水)", "5/15 (木)", "5/16 (金)"]
+    assert week.unique_periods == ["1", "2", "3", "4", "5", "6"]
+    assert week.week_range_str.endswith("_05-17") or week.week_range_str.endswith("_05-18")
+    assert len(week) == 2
+    first = week.class_rows[0]
+    assert first.name == "３－１"
+    assert first.lessons[0] == ("L0", "L1", "L2", "L3", "L4", "")
+    assert first.lessons[4] == ("L24", "L25", "L26", "L27", "L28", "L29")
+    assert week.class_rows[1].lessons == (("",) * 6,) * 5
+
+def test_parse_class_list_header_matches_week_model(tmp_path):
+    csv_path = tmp_path / "クラス一覧.csv"
+    _write_class_list_csv(csv_path, [[" ３－１"] + [" 数A"] * 30])
+
+    header_info = data_parser.parse_class_list_header(str(csv_path), "cp932", 1, 6)
+    week = data_parser.parse_class_list(str(csv_path), "cp932", 1, 6)
+
+    assert header_info == week.header_info()
+    assert header_info["header_day_columns_map"]["火"] == [7, 8, 9, 10, 11, 12]
+
+def test_streamed_class_list_reads_rows_lazily(tmp_path):
+    csv_path = tmp_path / "クラス一覧.csv"
+    _write_class_list_csv(csv_path, [[" ３－１"] + [f" L{i}" for i in range(30)], [" ３－２"] + [" "] * 30])
+
+    streamed = data_parser.StreamedClassList(str(csv_path), "cp932", 1, 6)
+    week = data_parser.parse_class_list(str(csv_path), "cp932", 1, 6)
+
+    assert streamed.header_info() == week.header_info()
+    rows = streamed.class_rows
+    assert iter(rows) is rows
+    assert [(row.name, row.lessons) for row in rows] == [(row.name, row.lessons) for row in week.class_rows]
+    # 参照するたびにファイルを開き直して先頭から解析する
+    assert [row.name for row in streamed.class_rows] == ["３－１", "３－２"]
+
+def test_streamed_class_list_rejects_a_file_saved_after_the_header(tmp_path):
+    csv_path = tmp_path / "クラス一覧.csv"
+    _write_class_list_csv(csv_path, [[" ３－１"] + [" 数A"] * 30, [" ３－２"] + [" 数B"] * 30])
+    streamed = data_parser.StreamedClassList(str(csv_path), "cp932", 1, 6)
+
+    # ヘッダーを読んだ後に保存し直されたファイルからは、データ行を作らない
+    _write_class_list_csv(csv_path, [[" ３－１"] + [" 英C"] * 30])
+    with pytest.raises(ValueError, match="読み込み中に変更されました"):
+        list(streamed.class_rows)
+
+    # データ行を読んでいる間に書き換えられた場合も、読み終えた時点でエラーにする
+    streamed = data_parser.StreamedClassList(str(csv_path), "cp932", 1, 6)
+    rows = streamed.class_rows
+    next(rows)
+    with open(csv_path, 'a', encoding='cp932', newline='') as f:
+        f.write('"３－９"\r\n')
+    with pytest.raises(ValueError, match="読み込み中に変更されました"):
+        list(rows)
+
+def test_parse_class_list_requires_header_rows(tmp_path):
+    csv_path = tmp_path / "クラス一覧.csv"
+    csv_path.write_text('"＜クラスの授業時間割一覧＞"\r\n', encoding='cp932')
+
+    with pytest.raises(ValueError):
+        data_parser.parse_class_list(str(csv_path), "cp932", 1, 6)
+
+def test_parse_class_list_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        data_parser.parse_class_list(str(tmp_path / "missing.csv"), "cp932", 1, 6)
+
+RECORD_COLUMNS = {"day": 0, "period": 1, "class_name": 3, "room": 4, "subject": 9, "teacher": 6}
+
+def _write_records_csv(path, records):
+    """時間割data.csv と同じレイアウト（cp932）のテスト用ファイルを書き出す"""
+    lines = []
+    for day, period, class_name, room, subject, teacher in records:
+        lines.append(",".join([day, period, "", class_name, room, "", teacher, "", "", subject, teacher, "", ""]))
+    with open(path, 'w', encoding='cp932', newline='') as f:
+        f.write("\r\n".join(lines) + "\r\n")
+
+def test_build_teacher_index_groups_records_by_teacher_and_slot(tmp_path):
+    csv_path = tmp_path / "時間割data.csv"
+    _write_records_csv(csv_path, [
+        ("月", "１", "３－１", "３－１", "論国", "奥山"),
+        ("月", "１", "３－１", "ゼミ３教室", "論国", "奥山"),   # 同じ授業の別教室は1つにまとめる
+        ("火", "６", "２－１", "２－１", "古典", "奥山"),
+        ("水", "２", "３－２", "３－２", "数A", "杉原"),
+        ("土", "１", "３－２", "３－２", "数A", "杉原"),        # 月～金以外は対象外
+        ("水", "７", "３－２", "３－２", "数A", "杉原"),        # 時限の範囲外は対象外
+    ])
+
+    teacher_index = data_parser.build_teacher_index(str(csv_path), "cp932", 6, RECORD_COLUMNS)
+
+    assert sorted(teacher_index) == ["奥山", "杉原"]
+    assert teacher_index["奥山"][0][0] == ["論国 ３－１"]
+    assert teacher_index["奥山"][1][5] == ["古典 ２－１"]
+    assert teacher_index["杉原"][2][1] == ["数A ３－２"]
+    assert sum(len(slot) for day in teacher_index["杉原"] for slot in day) == 1
+
+def test_load_teacher_info_list_splits_filename_and_name(tmp_path):
+    csv_path = tmp_path / "teacher_names.csv"
+    csv_path.write_text("\ufefft01_奥山\nt02_渡部\n\n", encoding='utf-8')
+
+    teacher_info_list = data_parser.load_teacher_info_list(str(csv_path), "utf-8-sig")
+
+    assert teacher_info_list == [{'name': "奥山", 'filename_base': "t01"}, {'name': "渡部", 'filename_base': "t02"}]
+
+def _write_teacher_timetable_csv(path, teachers):
+    """先生時間割.csv と同じレイアウト（cp932）のテスト用ファイルを書き出す"""
+    lines = ['"＜先生の授業時間割＞"', '" "']
+    for teacher_name, lessons in teachers:
+        lines.append(f'"先生名"," {teacher_name}"')
+        lines.append('" "," 4/28 (月)"," 4/29 (火)"," 4/30 (水)"," 5/1 (木)"," 5/2 (金)","",""')
+        for period in range(6):
+            subjects = [lessons.get((day, period), ("", ""))[0] for day in range(5)]
+            class_codes = [lessons.get((day, period), ("", ""))[1] for day in range(5)]
+            lines.append(",".join([f'"{"１２３４５６"[period]}"'] + [f'" {s}"' if s else '""' for s in subjects]))
+            lines.append(",".join(['" "'] + [f'" {c}"' if c else '""' for c in class_codes]))
+        lines.append(f'"合計時間",{len(lessons)}," 時間"')
+        lines.append('" "')
+    with open(path, 'w', encoding='cp932', newline='') as f:
+        f.write("\n".join(lines) + "\n")
+
+def test_parse_teacher_timetable_yields_grids_in_file_order(tmp_path):
+    csv_path = tmp_path / "先生時間割.csv"
+    teachers = [(f"先生{n}", {(n % 5, n % 6): ("論国", f"3{n % 4}")}) for n in range(7)]
+    teachers[0][1][(4, 5)] = ("国探 (国際 )", "2ｺ")
+    _write_teacher_timetable_csv(csv_path, teachers)
+
+    grids = list(data_parser.parse_teacher_timetable(str(csv_path), "cp932", 6))
+
+    assert [grid.name for grid in grids] == [name for name, _ in teachers]
+    first = grids[0]
+    assert first.header_dates == ["4/28 (月)", "4/29 (火)", "4/30 (水)", "5/1 (木)", "5/2 (金)"]
+    assert first.lessons[0][0] == ("論国", "30")
+    assert first.lessons[4][5] == ("国探 (国際 )", "2ｺ")
+    assert first.total_hours == 2
+    assert first.day_slots({"30": "３－１"})[0][0] == ["論国 ３－１"]
+
+    parallel_grids = list(data_parser.parse_teacher_timetable(str(csv_path), "cp932", 6, jobs=2, batch_size=3))
+    assert [(g.name, g.lessons) for g in parallel_grids] == [(g.name, g.lessons) for g in grids]
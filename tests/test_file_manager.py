@@ -0,0 +1,127 @@
+import os
+import sys
+import shutil
+
+import pytest
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_scripts import config
+from python_scripts import file_manager
+from python_scripts import pipeline
+from benchmarks import synthetic_data
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+def test_publish_staged_site_archives_previous_week(tmp_path):
+    cfg = {"github_pages_output_base_dir": str(tmp_path)}
+    _write(tmp_path / "latest" / "index.html", "old index")
+    _write(tmp_path / "latest" / "class" / "C11.html", "old C11")
+
+    staging_dir = file_manager.prepare_staging_dir(cfg)
+    assert os.listdir(staging_dir) == []
+    _write(os.path.join(staging_dir, "index.html"), "new index")
+
+    file_manager.publish_staged_site(cfg, staging_dir, "2025-05-12_05-18")
+
+    assert _read(tmp_path / "latest" / "index.html") == "new index"
+    assert not (tmp_path / "latest" / "class").exists()
+    assert _read(tmp_path / "2025-05-12_05-18" / "class" / "C11.html") == "old C11"
+    assert sorted(os.listdir(tmp_path)) == ["2025-05-12_05-18", "latest"]
+
+def test_seeded_staging_does_not_touch_latest_until_published(tmp_path):
+    cfg = {"github_pages_output_base_dir": str(tmp_path)}
+    _write(tmp_path / "latest" / "class" / "C11.html", "old C11")
+    _write(tmp_path / "latest" / "class" / "C12.html", "old C12")
+
+    staging_dir = file_manager.prepare_staging_dir(cfg, seed_from_latest=True)
+    # ステージングのファイルは latest とハードリンクを共有しているため、削除してから書き出す
+    os.remove(os.path.join(staging_dir, "class", "C11.html"))
+    _write(os.path.join(staging_dir, "class", "C11.html"), "new C11")
+
+    # 公開前は latest がそのまま残っている
+    assert _read(tmp_path / "latest" / "class" / "C11.html") == "old C11"
+
+    file_manager.publish_staged_site(cfg, staging_dir)
+
+    assert _read(tmp_path / "latest" / "class" / "C11.html") == "new C11"
+    assert _read(tmp_path / "latest" / "class" / "C12.html") == "old C12"
+    assert sorted(os.listdir(tmp_path)) == ["latest"]
+
+def test_prepare_staging_dir_discards_leftovers(tmp_path):
+    cfg = {"github_pages_output_base_dir": str(tmp_path)}
+    _write(tmp_path / file_manager.STAGING_DIRNAME / "half_written.html", "partial")
+
+    staging_dir = file_manager.prepare_staging_dir(cfg)
+
+    assert os.listdir(staging_dir) == []
+
+def test_publish_staged_site_refuses_to_overwrite_existing_archive(tmp_path):
+    cfg = {"github_pages_output_base_dir": str(tmp_path)}
+    _write(tmp_path / "latest" / "index.html", "old index")
+    _write(tmp_path / "2025-05-12_05-18" / "index.html", "archived index")
+    staging_dir = file_manager.prepare_staging_dir(cfg)
+    _write(os.path.join(staging_dir, "index.html"), "new index")
+
+    with pytest.raises(FileExistsError):
+        file_manager.publish_staged_site(cfg, staging_dir, "2025-05-12_05-18")
+
+    assert _read(tmp_path / "2025-05-12_05-18" / "index.html") == "archived index"
+    assert _read(tmp_path / "latest" / "index.html") == "old index"
+
+def test_publish_staged_site_swaps_latest_and_recovers_an_interrupted_swap(tmp_path):
+    cfg = {"github_pages_output_base_dir": str(tmp_path)}
+    _write(tmp_path / "latest" / "index.html", "<title>時間割 | 2025-05-12_05-18</title>")
+    # マニフェストがなくても、公開中の週は latest/index.html から分かる
+    assert file_manager.published_week_range(cfg) == "2025-05-12_05-18"
+
+    # latest を退避した直後に中断した状態は、次回の実行で元に戻す
+    os.rename(tmp_path / "latest", tmp_path / file_manager.PREVIOUS_LATEST_DIRNAME)
+    file_manager.recover_interrupted_publish(cfg)
+    assert file_manager.published_week_range(cfg) == "2025-05-12_05-18"
+
+    staging_dir = file_manager.prepare_staging_dir(cfg)
+    _write(os.path.join(staging_dir, "teacher", "t01.html"), "new t01")
+    file_manager.publish_staged_site(cfg, staging_dir, file_manager.published_week_range(cfg))
+
+    assert sorted(os.listdir(tmp_path / "latest")) == ["teacher"]
+    assert sorted(os.listdir(tmp_path)) == ["2025-05-12_05-18", "latest"]
+
+def test_publish_staged_site_skips_an_existing_archive_of_the_same_week(tmp_path):
+    cfg = {"github_pages_output_base_dir": str(tmp_path)}
+    _write(tmp_path / "latest" / "index.html", "<title>時間割 | 2025-05-12_05-18</title> new")
+    _write(tmp_path / "2025-05-12_05-18" / "index.html", "<title>時間割 | 2025-05-12_05-18</title> old")
+    staging_dir = file_manager.prepare_staging_dir(cfg)
+    _write(os.path.join(staging_dir, "index.html"), "<title>時間割 | 2025-05-19_05-25</title>")
+
+    # 前回の実行や backfill で作成済みのアーカイブは、上書きせずにそのまま使う
+    file_manager.publish_staged_site(cfg, staging_dir, "2025-05-12_05-18")
+
+    assert _read(tmp_path / "2025-05-12_05-18" / "index.html").endswith("old")
+    assert file_manager.published_week_range(cfg) == "2025-05-19_05-25"
+
+def test_generate_starts_from_the_committed_docs_layout(tmp_path, capsys):
+    # リポジトリの docs/ には latest と、同じ週の docs/2025-05-12_05-18 の両方がある
+    repo_docs_dir = os.path.join(os.path.dirname(__file__), '..', 'docs')
+    shutil.copytree(repo_docs_dir, tmp_path / "docs")
+    (week_start, week_dir), = synthetic_data.generate_weeks(str(tmp_path / "data"), num_classes=3)
+    cfg = config.load_config()
+    cfg["data_dir"] = week_dir
+    cfg["github_pages_output_base_dir"] = str(tmp_path / "docs")
+    archived_before = _read(tmp_path / "docs" / "2025-05-12_05-18" / "index.html")
+
+    class_list_week, master_class_info_list = pipeline.load_class_data(cfg, school_year=2025)
+    teacher_info_list, teacher_index = pipeline.load_teacher_data(cfg)
+    pipeline.publish_site(cfg, class_list_week, master_class_info_list, teacher_info_list, teacher_index)
+
+    assert "既にアーカイブ済み" in capsys.readouterr().out
+    assert _read(tmp_path / "docs" / "2025-05-12_05-18" / "index.html") == archived_before
+    assert file_manager.published_week_range(cfg) == class_list_week.week_range_str == "2025-04-07_04-13"
@@ -0,0 +1,231 @@
+import os
+import sys
+import shutil
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_scripts import config
+from python_scripts import data_parser
+from python_scripts import html_generator
+from python_scripts import pipeline
+from python_scripts import profiler
+
+def _make_config(output_dir):
+    cfg = config.load_config()
+    cfg["github_pages_output_base_dir"] = str(output_dir)
+    return cfg
+
+def _make_week(num_classes):
+    class_rows = []
+    for n in range(num_classes):
+        daily_lessons = tuple(
+            tuple("" if (day + period + n) % 4 == 0 else f"科目{day}{period}" for period in range(6))
+            for day in range(5)
+        )
+        class_rows.append(data_parser.ClassRow(f"１－{n}", daily_lessons))
+    return data_parser.ClassListWeek(
+        "2025-05-12_05-18",
+        ["1", "2", "3", "4", "5", "6"],
+        {},
+        ["5/12 (月)", "5/13 (火)", "5/14 (水)", "5/15 (木)", "5/16 (金)"],
+        class_rows,
+    )
+
+def _read_tree(root):
+    contents = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, encoding='utf-8') as f:
+                contents[os.path.relpath(path, root)] = f.read()
+    return contents
+
+def test_generate_all_htmls_writes_index_and_class_pages(tmp_path):
+    week = _make_week(2)
+    class_info = [{'name': "１－0", 'filename_base': "C10"}, {'name': "１－1", 'filename_base': "C11"}]
+
+    html_generator.generate_all_htmls(_make_config(tmp_path), week, class_info)
+
+    pages = _read_tree(tmp_path / "latest")
+    assert sorted(pages) == ["class/C10.html", "class/C11.html", "index.html"]
+    assert "./class/C11.html" in pages["index.html"]
+    assert "<td>科目01</td>" in pages["class/C10.html"]
+
+def test_generate_all_htmls_parallel_output_matches_serial(tmp_path, capsys):
+    week = _make_week(8)
+    class_info = [{'name': f"１－{n}", 'filename_base': f"C1{n}"} for n in range(9)]
+
+    html_generator.generate_all_htmls(_make_config(tmp_path / "serial"), week, class_info, jobs=1)
+    serial_log = capsys.readouterr().out.replace("serial", "")
+    html_generator.generate_all_htmls(_make_config(tmp_path / "parallel"), week, class_info, jobs=3)
+    parallel_log = capsys.readouterr().out.replace("parallel", "")
+
+    assert _read_tree(tmp_path / "serial") == _read_tree(tmp_path / "parallel")
+    assert serial_log == parallel_log
+    assert "'１－8' の時間割生成をスキップします" in parallel_log
+
+def test_generate_all_htmls_records_pages_relative_to_latest_with_worker_peaks(tmp_path):
+    week = _make_week(3)
+    class_info = [{'name': f"１－{n}", 'filename_base': f"C1{n}"} for n in range(3)]
+    with profiler.Profiler(enabled=True) as prof:
+        html_generator.generate_all_htmls(_make_config(tmp_path), week, class_info, jobs=2, profiler=prof)
+
+    pages = prof.report()["pages"]
+    assert sorted(page["path"] for page in pages) == ["class/C10.html", "class/C11.html", "class/C12.html", "index.html"]
+    # ワーカーでレンダリングしたページのピークメモリもワーカー側で計測される
+    assert all(page["peak_memory_bytes"] > 0 for page in pages)
+
+def test_generate_all_htmls_reuses_a_given_executor(tmp_path, monkeypatch):
+    week = _make_week(4)
+    class_info = [{'name': f"１－{n}", 'filename_base': f"C1{n}"} for n in range(4)]
+    cfg = _make_config(tmp_path / "reused")
+
+    with html_generator.page_executor(cfg["templates_dir"], cfg["template_cache_dir"], 2) as executor:
+        # プールを渡した場合は、生成のたびに新しいプールを作らない
+        monkeypatch.setattr(html_generator, "page_executor", None)
+        html_generator.generate_all_htmls(cfg, week, class_info, jobs=2, executor=executor, previous_page_hashes={})
+        html_generator.generate_all_htmls(cfg, week, class_info, jobs=2, executor=executor, previous_page_hashes={})
+    monkeypatch.undo()
+    html_generator.generate_all_htmls(_make_config(tmp_path / "serial"), week, class_info)
+
+    assert _read_tree(tmp_path / "reused") == _read_tree(tmp_path / "serial")
+
+def test_generate_all_htmls_skips_a_pool_created_before_a_template_change(tmp_path):
+    week = _make_week(4)
+    class_info = [{'name': f"１－{n}", 'filename_base': f"C1{n}"} for n in range(4)]
+    cfg = _make_config(tmp_path / "docs")
+    shutil.copytree(cfg["templates_dir"], tmp_path / "templates")
+    cfg["templates_dir"] = str(tmp_path / "templates")
+    cfg["template_cache_dir"] = str(tmp_path / "cache")
+    env = html_generator.create_jinja2_env(cfg["templates_dir"], cfg["template_cache_dir"])
+
+    with html_generator.page_executor(cfg["templates_dir"], cfg["template_cache_dir"], 2) as executor:
+        html_generator.generate_all_htmls(cfg, week, class_info, jobs=2, env=env, executor=executor)
+        class_template_path = tmp_path / "templates" / "class_template.html"
+        class_template_path.write_text(
+            class_template_path.read_text(encoding='utf-8').replace("</body>", "<p>更新後</p></body>"), encoding='utf-8'
+        )
+        # ワーカーは起動時に読み込んだテンプレートを使い続けるため、このプールは古いテンプレートのままになる
+        assert not html_generator.is_executor_current(executor, env)
+        html_generator.generate_all_htmls(cfg, week, class_info, jobs=2, env=env, executor=executor)
+
+    class_pages = [content for path, content in _read_tree(tmp_path / "docs" / "latest").items() if path.startswith("class")]
+    assert len(class_pages) == 4
+    assert all("<p>更新後</p>" in content for content in class_pages)
+
+def test_generate_all_htmls_consumes_class_rows_in_batches(tmp_path, capsys, monkeypatch):
+    week = _make_week(8)
+    class_info = [{'name': f"１－{n}", 'filename_base': f"C1{n}"} for n in range(9)]
+    html_generator.generate_all_htmls(_make_config(tmp_path / "eager"), week, class_info)
+    eager_log = capsys.readouterr().out.replace("eager", "")
+
+    monkeypatch.setattr(html_generator, "PAGE_BATCH_SIZE", 3)
+    week.class_rows = iter(week.class_rows)
+    html_generator.generate_all_htmls(_make_config(tmp_path / "streamed"), week, class_info)
+    streamed_log = capsys.readouterr().out.replace("streamed", "")
+
+    assert _read_tree(tmp_path / "eager") == _read_tree(tmp_path / "streamed")
+    assert eager_log == streamed_log
+    assert "のデータ行数 (8) を超えました" in streamed_log
+
+def test_generate_all_htmls_skips_unchanged_pages(tmp_path, capsys):
+    week = _make_week(3)
+    class_info = [{'name': f"１－{n}", 'filename_base': f"C1{n}"} for n in range(3)]
+    cfg = _make_config(tmp_path)
+
+    page_hashes = html_generator.generate_all_htmls(cfg, week, class_info)
+    assert sorted(page_hashes) == ["class/C10.html", "class/C11.html", "class/C12.html", "index.html"]
+
+    # 1クラスだけ授業を変更し、1クラスは Class_names.csv から外す
+    changed_lessons = (("変更",) * 6,) + week.class_rows[1].lessons[1:]
+    week.class_rows[1] = data_parser.ClassRow(week.class_rows[1].name, changed_lessons)
+    marker = "<!-- 前回の出力 -->"
+    for filename in ["C10.html", "C11.html"]:
+        with open(tmp_path / "latest" / "class" / filename, 'a', encoding='utf-8') as f:
+            f.write(marker)
+    capsys.readouterr()
+
+    new_hashes = html_generator.generate_all_htmls(cfg, week, class_info[:2], previous_page_hashes=page_hashes)
+
+    pages = _read_tree(tmp_path / "latest")
+    assert pages["class/C10.html"].endswith(marker)          # 変更なし → 書き出しを省略
+    assert not pages["class/C11.html"].endswith(marker)      # 変更あり → 再生成
+    assert "<td>変更</td>" in pages["class/C11.html"]
+    assert "class/C12.html" not in pages                     # 対象外 → 削除
+    assert new_hashes["class/C10.html"] == page_hashes["class/C10.html"]
+    assert new_hashes["class/C11.html"] != page_hashes["class/C11.html"]
+    assert "変更がないためスキップしました" in capsys.readouterr().out
+
+def test_generate_all_htmls_removes_dropped_pages_without_a_manifest(tmp_path):
+    week = _make_week(3)
+    class_info = [{'name': f"１－{n}", 'filename_base': f"C1{n}"} for n in range(3)]
+    cfg = _make_config(tmp_path)
+    html_generator.generate_all_htmls(cfg, week, class_info)
+
+    # --force やマニフェストがない場合（previous_page_hashes が空）も、Class_names.csv から外したクラスのページは残さない
+    html_generator.generate_all_htmls(cfg, week, class_info[:2], previous_page_hashes={})
+
+    assert sorted(_read_tree(tmp_path / "latest")) == ["class/C10.html", "class/C11.html", "index.html"]
+
+def test_publish_site_with_force_removes_a_class_dropped_from_class_names(tmp_path):
+    week = _make_week(3)
+    class_info = [{'name': f"１－{n}", 'filename_base': f"C1{n}"} for n in range(3)]
+    cfg = _make_config(tmp_path)
+    pipeline.publish_site(cfg, week, class_info, None, None)
+
+    # 同じ週の --force はステージングに latest を引き継ぐが、外したクラスのページは削除する
+    pipeline.publish_site(cfg, week, class_info[:2], None, None, force=True)
+
+    assert sorted(os.listdir(tmp_path / "latest" / "class")) == ["C10.html", "C11.html"]
+
+def test_generate_all_htmls_writes_teacher_pages(tmp_path):
+    week = _make_week(1)
+    class_info = [{'name': "１－0", 'filename_base': "C10"}]
+    teacher_info = [{'name': "奥山", 'filename_base': "t01"}, {'name': "渡部", 'filename_base': "t02"}]
+    day_slots = [[[] for _ in range(6)] for _ in range(5)]
+    day_slots[1][2] = ["論国 ３－１", "論国 ３－２"]
+
+    page_hashes = html_generator.generate_all_htmls(
+        _make_config(tmp_path), week, class_info,
+        teacher_info_list=teacher_info, teacher_index={"奥山": day_slots}
+    )
+
+    pages = _read_tree(tmp_path / "latest")
+    assert "teacher/t01.html" in page_hashes and "teacher/t02.html" in page_hashes
+    assert "./teacher/t01.html" in pages["index.html"]
+    assert "<td>論国 ３－１、論国 ３－２</td>" in pages["teacher/t01.html"]
+    assert "奥山先生 の時間割" in pages["teacher/t01.html"]
+    assert "<td>論国" not in pages["teacher/t02.html"]
+
+def test_generate_all_htmls_warns_about_teachers_missing_from_teacher_names(tmp_path, capsys):
+    week = _make_week(1)
+    class_info = [{'name': "１－0", 'filename_base': "C10"}]
+    teacher_info = [{'name': "奥山", 'filename_base': "t01"}]
+    day_slots = [[[] for _ in range(6)] for _ in range(5)]
+    day_slots[0][0] = ["英C ３－１"]
+
+    page_hashes = html_generator.generate_all_htmls(
+        _make_config(tmp_path), week, class_info,
+        teacher_info_list=teacher_info, teacher_index={"奥山": day_slots, "エスタ": day_slots}
+    )
+
+    output = capsys.readouterr().out
+    assert "警告: 時間割に授業がある 'エスタ' 先生が教師名ファイルにないため、ページを生成しません。" in output
+    assert "'奥山' 先生が教師名ファイルにない" not in output
+    assert sorted(key for key in page_hashes if key.startswith("teacher/")) == ["teacher/t01.html"]
+
+def test_generate_all_htmls_renders_table_inline_and_caches_compiled_templates(tmp_path):
+    week = _make_week(1)
+    class_info = [{'name': "1年0組", 'filename_base': "C10"}]
+    cfg = _make_config(tmp_path / "docs")
+    cfg["template_cache_dir"] = str(tmp_path / "cache")
+
+    html_generator.generate_all_htmls(cfg, week, class_info)
+
+    page = _read_tree(tmp_path / "docs" / "latest")["class/C10.html"]
+    # ページ名は表示名、テーブルの見出しは クラス一覧.csv の名前
+    assert "<h1>1年0組 の時間割" in page
+    assert "<h3>１－0の時間割詳細</h3>" in page
+    assert page.count("<table") == 1
+    assert len(os.listdir(tmp_path / "cache")) == len(html_generator.PAGE_TEMPLATE_NAMES)
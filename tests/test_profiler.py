@@ -0,0 +1,58 @@
+import os
+import sys
+import json
+import tracemalloc
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_scripts import profiler
+
+def test_profiler_records_phases_pages_and_bytes(tmp_path):
+    trace_path = tmp_path / "trace.json"
+    with profiler.Profiler(enabled=True) as prof:
+        prof.add_phase("import", 0.5)
+        page_stats = {"path": "class/C31.html", "wall_seconds": 0.01, "cpu_seconds": 0.01, "bytes": 1200}
+        with prof.phase("render_pages"):
+            with profiler.track_page_peak(page_stats):
+                "x" * 1000000
+        prof.record_page(page_stats)
+        prof.record_page({"path": "class/C32.html", "wall_seconds": 0.02, "cpu_seconds": 0.02, "bytes": 800})
+        prof.record_skipped_page()
+    # 閉じた後も計測結果は書き出せる
+    prof.write_json(str(trace_path))
+    with open(trace_path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+
+    assert [phase["name"] for phase in report["phases"]] == ["import", "render_pages"]
+    # ページ単位でピークをリセットしても、フェーズのピークにはそのページの分が残る
+    assert report["pages"][0]["peak_memory_bytes"] >= 1000000
+    assert report["phases"][1]["peak_memory_bytes"] >= report["pages"][0]["peak_memory_bytes"]
+    assert report["max_page_peak_memory_bytes"] == report["pages"][0]["peak_memory_bytes"]
+    assert report["pages_written"] == 2
+    assert report["pages_skipped"] == 1
+    assert report["bytes_written"] == 2000
+
+def test_profiler_stops_only_the_tracemalloc_it_started():
+    with profiler.Profiler(enabled=True):
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+    tracemalloc.start()
+    try:
+        with profiler.Profiler(enabled=True):
+            pass
+        # 呼び出し元が開始した tracemalloc は止めない
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+def test_disabled_profiler_records_nothing():
+    prof = profiler.Profiler(enabled=False)
+    with prof.phase("render_pages"):
+        pass
+    prof.record_page({"path": "class/C31.html", "wall_seconds": 0.01, "cpu_seconds": 0.01, "bytes": 1200})
+
+    report = prof.report()
+    assert report["phases"] == []
+    assert report["bytes_written"] == 0
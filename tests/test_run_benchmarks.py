@@ -0,0 +1,22 @@
+import os
+import sys
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import run_benchmarks
+
+def _result(generate, render_pages):
+    return {
+        "parse": 0.01, "generate": generate, "rerun": 0.1, "next_week": 0.3,
+        "phases": {"generate": {"render_pages": render_pages, "publish": 0.01}},
+    }
+
+def test_compare_with_baseline_checks_the_phase_breakdown():
+    baseline = {"_machine": run_benchmarks.machine_info(), "18classes_4weeks": _result(1.0, 0.5)}
+
+    # 全体の時間が許容範囲内でも、内訳の処理が遅くなれば報告する
+    regressions = run_benchmarks.compare_with_baseline({"18classes_4weeks": _result(1.1, 0.9)}, baseline, 0.25)
+
+    assert regressions == ["18classes_4weeks: generate.render_pages 0.5000s → 0.9000s"]
+    assert run_benchmarks.compare_with_baseline({"18classes_4weeks": _result(1.0, 0.5)}, baseline, 0.25) == []
@@ -0,0 +1,27 @@
+import os
+import sys
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import startup_benchmark
+
+IMPORTTIME_SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | io
+import time:        50 |         50 |     jinja2.utils
+import time:       200 |        250 |   jinja2.environment
+import time:       400 |        650 | jinja2
+import time:        80 |         80 |   csv
+import time:       100 |        180 | python_scripts.data_parser
+import time:        30 |         30 | python_scripts.utils
+"""
+
+def test_parse_importtime_counts_only_top_level_imports():
+    cumulative = startup_benchmark.parse_importtime(IMPORTTIME_SAMPLE)
+
+    # 入れ子のインポート（_io, jinja2.environment, csv など）は親の累積に含まれるため数えない
+    assert set(cumulative) == {"io", "jinja2", "python_scripts"}
+    assert abs(cumulative["jinja2"] - 650e-6) < 1e-9
+    assert abs(cumulative["python_scripts"] - 210e-6) < 1e-9
@@ -0,0 +1,43 @@
+import os
+import sys
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import synthetic_data
+from python_scripts import config
+from python_scripts import data_parser
+from python_scripts import validator
+
+def test_generated_weeks_parse_in_the_real_layout(tmp_path):
+    weeks = synthetic_data.generate_weeks(str(tmp_path), num_classes=30, num_weeks=2)
+    assert len(weeks) == 2
+
+    cfg = config.load_config()
+    cfg["data_dir"] = weeks[1][1]
+    week = data_parser.parse_class_list(
+        os.path.join(cfg["data_dir"], cfg["class_list_csv_filename"]), cfg["csv_encoding"], 1, 6
+    )
+    class_info = data_parser.load_class_names_list(
+        os.path.join(cfg["data_dir"], cfg["class_names_csv_filename"]), cfg["csv_encoding"]
+    )
+    teacher_info = data_parser.load_teacher_info_list(
+        os.path.join(cfg["data_dir"], cfg["teacher_names_csv_filename"]), cfg["teacher_names_csv_encoding"]
+    )
+
+    assert len(week) == len(class_info) == 30
+    assert week.header_dates_decoded[0] == "4/14 (月)"
+    assert len(teacher_info) == 90
+    # 生成データには重複も対応のないクラスもない
+    report = validator.validate(cfg, week, class_info)
+    assert report == {"teacher_double_bookings": [], "room_clashes": [], "unmatched_classes": []}
+
+def test_make_week_lessons_changes_only_some_classes_each_week():
+    school = synthetic_data.make_school(300)
+    weeks = [synthetic_data.make_week_lessons(school, week_index) for week_index in range(3)]
+
+    for previous_week, week in zip(weeks, weeks[1:]):
+        changed = sum(previous_lessons != lessons for previous_lessons, lessons in zip(previous_week, week))
+        # 入れ替わるのは約1割（300クラス中の期待値 30）。ほかのクラスは前の週と同じ
+        assert 10 <= changed <= 55
+    assert synthetic_data.make_week_lessons(school, 2) == weeks[2]
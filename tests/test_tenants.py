@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import datetime
+
+import pytest
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_scripts import config
+from python_scripts import tenants
+from benchmarks import synthetic_data
+
+def _write_tenants(path, tenant_list):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"tenants": tenant_list}, f, ensure_ascii=False)
+
+def test_load_tenant_configs_resolves_paths_and_overrides(tmp_path):
+    _write_tenants(tmp_path / "tenants.json", [
+        {"name": "a", "data_dir": "a/data", "github_pages_output_base_dir": "a/docs", "num_periods_per_day": 7,
+         "double_booking_exempt_subjects": ["調査", "鑑賞", "英試"]},
+    ])
+
+    (name, cfg), = config.load_tenant_configs(str(tmp_path / "tenants.json"))
+
+    assert name == "a"
+    assert cfg["data_dir"] == str(tmp_path / "a" / "data")
+    assert cfg["num_periods_per_day"] == 7
+    assert cfg["double_booking_exempt_subjects"] == ["調査", "鑑賞", "英試"]
+    assert config.load_config()["double_booking_exempt_subjects"] == []
+    assert cfg["csv_encoding"] == "cp932"
+
+def test_load_tenant_configs_rejects_unknown_keys(tmp_path):
+    _write_tenants(tmp_path / "tenants.json", [{"name": "a", "data_directory": "a/data"}])
+
+    with pytest.raises(ValueError, match="data_directory"):
+        config.load_tenant_configs(str(tmp_path / "tenants.json"))
+
+@pytest.mark.parametrize("tenant", [
+    "a",
+    {"name": "a", "num_periods_per_day": "7"},
+    {"name": "a", "stream_class_rows": 1},
+    {"name": "a", "num_periods_per_day": True},
+])
+def test_load_tenant_configs_rejects_malformed_entries(tmp_path, tenant):
+    _write_tenants(tmp_path / "tenants.json", [tenant])
+
+    with pytest.raises(ValueError, match="エラー"):
+        config.load_tenant_configs(str(tmp_path / "tenants.json"))
+
+def test_run_tenants_isolates_failures(tmp_path):
+    school = synthetic_data.make_school(3, num_periods=7)
+    synthetic_data.write_week(str(tmp_path / "a" / "data"), school, datetime.date(2025, 4, 7), synthetic_data.make_week_lessons(school, 0))
+    _write_tenants(tmp_path / "tenants.json", [
+        {"name": "broken", "data_dir": "missing", "github_pages_output_base_dir": "broken/docs"},
+        {"name": "a", "data_dir": "a/data", "github_pages_output_base_dir": "a/docs", "num_periods_per_day": 7,
+         "github_pages_base_url": "https://example.org/a"},
+    ])
+
+    results = tenants.run_tenants(config.load_tenant_configs(str(tmp_path / "tenants.json")))
+
+    assert [(result["name"], result["status"]) for result in results] == [("broken", "failed"), ("a", "ok")]
+    assert "FileNotFoundError" in results[0]["error"]
+    assert tenants.print_summary(results) == 1
+    with open(tmp_path / "a" / "docs" / "latest" / "class" / "C3_001.html", encoding='utf-8') as f:
+        page = f.read()
+    # 7時限の学校でも日付の列を正しく読む
+    assert "<th>4/11 (金)</th>" in page
+    assert page.count("<tr>") == 8
+    # スタイルシートは自校の公開先から読み込み、出力先にもコピーされている
+    assert 'href="https://example.org/a/style.css"' in page
+    assert os.path.isfile(tmp_path / "a" / "docs" / "style.css")
+    assert os.path.isfile(tmp_path / "a" / "docs" / "print.css")
+    assert os.path.isfile(tmp_path / "broken" / "docs" / tenants.TENANT_LOG_FILENAME)
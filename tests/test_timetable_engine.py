@@ -0,0 +1,24 @@
+import os
+import sys
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_scripts import timetable_engine
+
+def test_compact_class_lessons_shifts_lessons_forward_and_transposes():
+    lessons = (("", "数A", "", "英C"), ("国", "", "", ""), ("", "", "", ""), ("体", "体", "体", "体"), ("", "", "", "LHR"))
+
+    compacted = timetable_engine.compact_class_lessons(lessons, 4)
+
+    # 時限 × 曜日（月～金）
+    assert compacted == [
+        ["数A", "国", "-", "体", "LHR"],
+        ["英C", "-", "-", "体", "-"],
+        ["-", "-", "-", "体", "-"],
+        ["-", "-", "-", "体", "-"],
+    ]
+
+def test_compact_class_lessons_without_lessons():
+    compacted = timetable_engine.compact_class_lessons((("", "", "", ""),) * 5, 4)
+    assert compacted == [["-"] * 5] * 4
@@ -0,0 +1,101 @@
+import os
+import sys
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_scripts import config
+from python_scripts import data_parser
+from python_scripts import utils
+from python_scripts import validator
+
+def _write_records_csv(path, records):
+    """時間割data.csv と同じレイアウト（cp932）のテスト用ファイルを書き出す"""
+    lines = []
+    for day, period, class_name, room, subject, teacher in records:
+        lines.append(",".join([day, period, "", class_name, room, "", teacher, "", "", subject, teacher, "", ""]))
+    with open(path, 'w', encoding='cp932', newline='') as f:
+        f.write("\r\n".join(lines) + "\r\n")
+
+def _make_week(class_names):
+    empty_lessons = (("",) * 6,) * 5
+    return data_parser.ClassListWeek(
+        "2025-05-12_05-18", ["1", "2", "3", "4", "5", "6"], {}, ["(月)", "(火)", "(水)", "(木)", "(金)"],
+        [data_parser.ClassRow(name, empty_lessons) for name in class_names],
+    )
+
+def test_normalize_class_name_joins_display_and_csv_names():
+    assert utils.normalize_class_name("3年1組") == utils.normalize_class_name(" ３－１")
+    assert utils.normalize_class_name("3年理探") == utils.normalize_class_name("３理探")
+    assert utils.normalize_class_name("3年1組") != utils.normalize_class_name("3年2組")
+
+def test_validate_reports_double_bookings_room_clashes_and_unmatched_classes(tmp_path):
+    _write_records_csv(tmp_path / "時間割data.csv", [
+        ("月", "１", "３－１", "３－１", "論国", "奥山"),
+        ("月", "１", "３－２", "３－２", "論国", "奥山"),       # 奥山先生が同じコマに2教室
+        ("月", "２", "３－１", "ゼミ３教室", "数A", "杉原"),
+        ("月", "２", "３－１", "ゼミ３教室", "数A", "髙橋秀"),  # 同じ授業のTTは問題なし
+        ("月", "２", "３－２", "ゼミ３教室", "古典", "渡部"),   # 同じ教室で別の科目
+        ("火", "１", "３－５", "３－５", "体", "小野"),         # クラス一覧.csv にないクラス
+    ])
+    cfg = config.load_config()
+    cfg["data_dir"] = str(tmp_path)
+    class_info = [{'name': "3年1組", 'filename_base': "C31"}, {'name': "3年4組", 'filename_base': "C34"}]
+    # Class_names.csv と クラス一覧.csv の行の順序が違っても、名前で突き合わせる
+    week = _make_week(["３－２", "３－１"])
+
+    report = validator.validate(cfg, week, class_info)
+
+    assert len(report["teacher_double_bookings"]) == 1
+    assert "奥山" in report["teacher_double_bookings"][0]
+    assert len(report["room_clashes"]) == 1
+    assert "ゼミ３教室" in report["room_clashes"][0]
+    unmatched = report["unmatched_classes"]
+    assert len(unmatched) == 3
+    assert any("'3年4組'" in problem for problem in unmatched)
+    assert any("'３－２'" in problem and "Class_names.csv にありません" in problem for problem in unmatched)
+    assert any("'３－５'" in problem for problem in unmatched)
+    assert validator.print_report(report) == 5
+
+def _make_teacher_grid(name, lessons, header_dates=("(月)", "(火)", "(水)", "(木)", "(金)")):
+    grid_lessons = tuple(tuple(lessons.get((day, period)) for period in range(6)) for day in range(5))
+    return data_parser.TeacherGrid(name, list(header_dates), grid_lessons, len(lessons))
+
+def test_find_teacher_grid_mismatches_checks_teacher_lessons_against_class_rows():
+    lessons_31 = (("論国", "", "", "", "", ""),) + (("",) * 6,) * 4
+    lessons_3r = (("", "古典", "", "", "", ""),) + (("",) * 6,) * 4
+    week = _make_week([])
+    week.class_rows = [data_parser.ClassRow("３－１", lessons_31), data_parser.ClassRow("３理探", lessons_3r)]
+    suffixes = config.load_config()["teacher_class_code_suffixes"]
+    grids = [
+        _make_teacher_grid("奥山", {(0, 0): ("論国", "31"), (0, 1): ("古典 (古典 )", "3ﾘ")}),
+        _make_teacher_grid("渡部", {(0, 2): ("数A", "31、35"), (1, 0): ("会議", "※")}),
+    ]
+
+    problems = validator.find_teacher_grid_mismatches(grids, week, suffixes)
+
+    assert len(problems) == 2
+    assert "月3限: 渡部 先生の 数A (31、35)" in problems[0] and "'空き'" in problems[0]
+    assert "'31、35'" in problems[1]
+    # 週が違うファイルは突き合わせない
+    stale_grid = _make_teacher_grid("奥山", {}, ["4/28 (月)", "4/29 (火)", "4/30 (水)", "5/1 (木)", "5/2 (金)"])
+    assert len(validator.find_teacher_grid_mismatches([stale_grid], week, suffixes)) == 1
+
+def test_validate_exempts_whole_grade_and_split_lessons(tmp_path):
+    records = [("火", "２", f"１－{n}", f"１－{n}", "調査", "半澤弘") for n in range(1, 4)]
+    records += [
+        ("月", "５", "３－４", "３－４", "古典", "奥山"),
+        ("月", "５", "３－４", "３－４", "漢文", "加藤"),    # 1クラスの分割授業
+        ("水", "１", "３－１", "３－１", "論国", "奥山"),
+        ("水", "１", "３－２", "３－２", "論国", "奥山"),    # 除外しない科目は重複として報告する
+    ]
+    _write_records_csv(tmp_path / "時間割data.csv", records)
+    cfg = config.load_config()
+    cfg["data_dir"] = str(tmp_path)
+    cfg["double_booking_exempt_subjects"] = ["調査"]
+
+    report = validator.validate(cfg, _make_week([]), [])
+
+    assert len(report["teacher_double_bookings"]) == 1
+    assert "水1限: 奥山" in report["teacher_double_bookings"][0]
+    assert report["room_clashes"] == []
@@ -0,0 +1,63 @@
+import os
+import sys
+
+# プロジェクトルートをPythonのパスに追加し、python_scripts パッケージをインポートできるようにする
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_scripts import watcher
+
+def test_file_cache_reloads_only_changed_files(tmp_path):
+    path = tmp_path / "クラス一覧.csv"
+    path.write_text("1", encoding='utf-8')
+    loads = []
+
+    def loader(p):
+        loads.append(p)
+        with open(p, encoding='utf-8') as f:
+            return f.read()
+
+    cache = watcher.FileCache()
+    assert cache.load(str(path), loader) == "1"
+    assert cache.load(str(path), loader) == "1"
+    path.write_text("22", encoding='utf-8')
+    assert cache.load(str(path), loader) == "22"
+    assert len(loads) == 2
+
+class _FakeClock:
+    """watcher の time.sleep / time.monotonic の代わりに、眠った分だけ進む時計。予定時刻になった処理を実行する"""
+
+    def __init__(self, scheduled):
+        self.now = 0.0
+        self.scheduled = sorted(scheduled, key=lambda item: item[0])
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        while self.scheduled and self.scheduled[0][0] <= self.now:
+            self.scheduled.pop(0)[1]()
+
+def test_watch_runs_once_per_burst_of_saves(tmp_path, monkeypatch):
+    path = tmp_path / "クラス一覧.csv"
+    path.write_text("0", encoding='utf-8')
+
+    def save(n):
+        return lambda: path.write_text("x" * n, encoding='utf-8')
+
+    # 保存の間隔 (0.05秒) は debounce (0.1秒) より短いため、続けて行われた3回の保存は1回の変更として扱われる
+    clock = _FakeClock([(1.0, save(1)), (1.05, save(2)), (1.1, save(3))])
+    monkeypatch.setattr(watcher, "time", clock)
+    calls = []
+
+    def on_change():
+        calls.append((clock.now, path.read_text(encoding='utf-8')))
+
+    watcher.watch(
+        [str(path), str(tmp_path / "missing.csv")], on_change, poll_interval=0.01, debounce=0.1,
+        should_stop=lambda: clock.now > 2.0
+    )
+
+    assert [content for _, content in calls] == ["0", "xxx"]
+    # 最後の保存から debounce 秒が過ぎてから生成する
+    assert calls[1][0] >= 1.1 + 0.1